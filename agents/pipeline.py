@@ -12,7 +12,6 @@ from __future__ import annotations
 
 import json
 import time
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
@@ -20,6 +19,7 @@ from agents.base import AgentResult
 from agents.repo_analysis import RepoAnalysisAgent
 from agents.reasoning_loop import run_reasoning_loop, ReasoningLoopResult
 from shared.results_exporter import export_results
+from shared.timestamps import utc_now_iso
 
 RESULTS_FILE = Path(__file__).resolve().parents[1] / "shared" / "results.json"
 
@@ -73,7 +73,7 @@ async def run_pipeline(
         ),
         "details": loop_result.to_dict(),
         "errors": [],
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": utc_now_iso(),
     })
 
     runtime_seconds = time.monotonic() - pipeline_start
@@ -82,7 +82,7 @@ async def run_pipeline(
         "job_id": job_id,
         "repo_url": repo_url,
         "status": loop_result.status,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": utc_now_iso(),
         "agent_results": results,
         "reasoning_loop": loop_result.to_dict(),
     }
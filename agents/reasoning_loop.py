@@ -23,7 +23,6 @@ from __future__ import annotations
 import asyncio
 import logging
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, TypedDict
 
@@ -40,6 +39,7 @@ from agents.tools.commit_push_tool import CommitPushTool
 from agents.tools.wait_for_ci_tool import WaitForCITool
 from agents.tools.fetch_ci_results_tool import FetchCIResultsTool
 from agents.tools.verification_tool import VerificationTool
+from shared.timestamps import utc_now_iso
 
 logger = logging.getLogger(__name__)
 
@@ -90,9 +90,7 @@ class IterationReport:
     ci_conclusion: str = ""
     all_passed: bool = False
     verdict: str = ""
-    timestamp: str = field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
-    )
+    timestamp: str = field(default_factory=utc_now_iso)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -11,10 +11,12 @@ The final aggregated state is exported via ``to_dict()`` for
 
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
 from typing import Any
 
+from shared.timestamps import utc_now_iso
+
 
 # ── Record dataclasses ───────────────────────────────────────────────
 
@@ -27,6 +29,16 @@ class FailureRecord:
     bug_type: str
     standardized_message: str
     iteration: int
+    # Canonical detection line, formatted once at ingest:
+    # "{file} — Line {line}: {standardized_message}"
+    description: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "description",
+            f"{self.file} — Line {self.line}: {self.standardized_message}",
+        )
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -95,6 +107,16 @@ class RunMemory:
         self._failures: list[FailureRecord] = []
         self._fixes: list[FixRecord] = []
         self._ci_runs: list[CIRunRecord] = []
+        # Commit SHA → number of recorded fixes carrying it, kept up to
+        # date on append so unique_commit_count never rescans the fixes.
+        self._commit_refs: Counter[str] = Counter()
+        # Highest iteration with a passing CI run, kept up to date on append.
+        self._latest_success: int | None = None
+        # (file, line) → bug_type and file → bug_type; rebuilt lazily
+        # after append_failures() invalidates it.
+        self._bug_type_index: tuple[
+            dict[tuple[str, int], str], dict[str, str]
+        ] | None = None
 
     # ── Read-only properties ─────────────────────────────────────────
 
@@ -127,6 +149,7 @@ class RunMemory:
         """
         # Deduplicate: remove any failures previously appended for this iteration
         self._failures = [f for f in self._failures if f.iteration != iteration]
+        self._bug_type_index = None
         
         for bug in classified_bugs:
             record = FailureRecord(
@@ -153,8 +176,18 @@ class RunMemory:
             commit_hash:     Short SHA from CommitPushTool.
         """
         # Deduplicate: remove any fixes previously appended for this iteration
-        self._fixes = [f for f in self._fixes if f.iteration != iteration]
-        
+        replaced = self.fixes_for_iteration(iteration)
+        if replaced:
+            self._fixes = [f for f in self._fixes if f.iteration != iteration]
+            for f in replaced:
+                if f.commit_hash:
+                    self._commit_refs[f.commit_hash] -= 1
+                    if not self._commit_refs[f.commit_hash]:
+                        del self._commit_refs[f.commit_hash]
+
+        if commit_hash and applied_patches:
+            self._commit_refs[commit_hash] += len(applied_patches)
+
         for patch in applied_patches:
             bug = patch.get("bug", {})
             record = FixRecord(
@@ -187,9 +220,9 @@ class RunMemory:
         self._ci_runs = [r for r in self._ci_runs if r.iteration != iteration]
         
         if not start_time:
-            start_time = datetime.now(timezone.utc).isoformat()
+            start_time = utc_now_iso()
         if not end_time:
-            end_time = datetime.now(timezone.utc).isoformat()
+            end_time = utc_now_iso()
 
         record = CIRunRecord(
             iteration=iteration,
@@ -199,12 +232,51 @@ class RunMemory:
         )
         self._ci_runs.append(record)
 
+        if status == "success":
+            if self._latest_success is None or iteration > self._latest_success:
+                self._latest_success = iteration
+        elif iteration == self._latest_success:
+            # The passing run we tracked was just replaced; rescan (rare).
+            self._latest_success = max(
+                (r.iteration for r in self._ci_runs if r.status == "success"),
+                default=None,
+            )
+
     # ── Query methods ────────────────────────────────────────────────
 
     def latest_ci_run(self) -> CIRunRecord | None:
         """Return the most recent CI run, or None if no runs exist."""
         return self._ci_runs[-1] if self._ci_runs else None
 
+    def bug_type_for(self, file: str, line: int) -> str:
+        """Return the bug_type of the failure at *file*:*line*.
+
+        Falls back to the first failure in *file* (by line), then to
+        ``"unknown"``.  Lookups are O(1) against an index built once per
+        batch of appended failures.
+        """
+        if self._bug_type_index is None:
+            by_line: dict[tuple[str, int], str] = {}
+            by_file: dict[str, str] = {}
+            for f in self.failures:
+                by_line.setdefault((f.file, f.line), f.bug_type)
+                by_file.setdefault(f.file, f.bug_type)
+            self._bug_type_index = (by_line, by_file)
+
+        by_line, by_file = self._bug_type_index
+        bug_type = by_line.get((file, line))
+        return bug_type if bug_type is not None else by_file.get(file, "unknown")
+
+    @property
+    def unique_commit_count(self) -> int:
+        """Number of distinct non-empty commit SHAs across recorded fixes."""
+        return len(self._commit_refs)
+
+    @property
+    def latest_success_iteration(self) -> int | None:
+        """Highest iteration whose CI run passed, or None if none did."""
+        return self._latest_success
+
     def failures_for_iteration(self, iteration: int) -> list[FailureRecord]:
         """Return all failures from a specific iteration."""
         return [f for f in self._failures if f.iteration == iteration]
@@ -565,6 +565,25 @@ class TestRunMemory:
         assert d["summary"]["total_ci_runs"] == 1
         assert d["summary"]["unique_files_with_failures"] == 1
 
+    def test_unique_commit_count_tracks_replaced_fixes(self):
+        """Re-appending an iteration's fixes must drop its old commit SHA."""
+        mem = RunMemory()
+        assert mem.unique_commit_count == 0
+
+        mem.append_fixes(1, [
+            {"file": "a.py", "bug": {"line": 1}, "description": "fix a"},
+            {"file": "b.py", "bug": {"line": 2}, "description": "fix b"},
+        ], "sha111")
+        mem.append_fixes(2, [
+            {"file": "c.py", "bug": {"line": 3}, "description": "fix c"},
+        ], "sha222")
+        assert mem.unique_commit_count == 2
+
+        mem.append_fixes(2, [
+            {"file": "c.py", "bug": {"line": 3}, "description": "fix c"},
+        ], "")
+        assert mem.unique_commit_count == 1
+
     def test_done_includes_memory_in_result(self, tmp_path):
         """ReasoningLoopResult.memory must contain the full aggregated state."""
         repo = _make_repo(tmp_path)
@@ -19,15 +19,25 @@ class Settings(BaseSettings):
     SANDBOX_TIMEOUT: int = 300
     SANDBOX_MEMORY_LIMIT: str = "512m"
     SANDBOX_CPU_LIMIT: float = 1.0
+    SANDBOX_POOL_SIZE: int = 0  # warm containers per image; 0 disables pooling
+    SANDBOX_DEP_CACHE_SIZE: int = 8  # cached dependency images; 0 disables
+    SANDBOX_MAX_PARALLEL: int = 10  # concurrent container create/start calls
 
     GITHUB_TOKEN: str = ""
+    GITHUB_TOKENS: str = ""  # comma-separated extra tokens, rotated round-robin
     GITHUB_WEBHOOK_SECRET: str = ""
     CI_POLL_INTERVAL: int = 60
+    USE_LIBGIT2: bool = True  # in-process git via pygit2; False → git CLI
+    REPO_CACHE_DIR: str = ""  # bare-mirror dir (opt-in); "" disables
+    MAX_PARALLEL_GIT: int = min(8, (os.cpu_count() or 1) * 2)  # bulk git jobs
 
     GEMINI_API_KEY: str = ""
     GEMINI_API_BASE: str = "https://generativelanguage.googleapis.com/v1beta/openai"
     GEMINI_MODEL: str = "gemini-2.0-flash"
 
+    MAX_PROGRESS_EVENTS: int = 500  # per-run progress ring buffer size
+    MAX_STORED_RUNS: int = 1024  # in-memory runs kept before LRU eviction
+
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "shared/logs/app.log"
 
@@ -1,5 +1,6 @@
 """FastAPI application entry point."""
 
+import asyncio
 import logging
 import sys
 from pathlib import Path
@@ -9,6 +10,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.routes import agents, health, results
+from app.services.github_service import drain_trash
 
 # ── Logging configuration ────────────────────────────────────────────
 
@@ -77,9 +79,15 @@ app.include_router(agents.router, tags=["agents"])
 app.include_router(results.router, prefix="/api/results", tags=["results"])
 
 
+# Strong reference so the trash drainer isn't garbage-collected
+_trash_drainer: asyncio.Task | None = None
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup."""
+    global _trash_drainer
+    _trash_drainer = asyncio.create_task(drain_trash(), name="trash-drainer")
     _logger.info(
         "Starting Self-Healing System | env=%s | log_level=%s | log_file=%s",
         settings.APP_ENV, settings.LOG_LEVEL, settings.LOG_FILE,
@@ -29,7 +29,7 @@ from agents.base import AgentResult
 from shared.results_exporter import build_results, export_results
 
 from app.store import RunState
-from app.services.github_service import GitHubService, GitCommandError
+from app.services.github_service import GitHubService, GitCommandError, GitHubAPIError
 
 logger = logging.getLogger(__name__)
 
@@ -202,9 +202,7 @@ async def execute_pipeline(state: RunState) -> None:
         # ── 6. Export canonical results.json ──────────────────────
         memory_ref = loop_result._memory_ref
         # Collect git operation entries for inclusion in final results
-        git_operations = [
-            p for p in state.progress if p.get("agent") == "github"
-        ]
+        git_operations = list(state.git_operations)
         if memory_ref is not None:
             canonical = export_results(
                 memory=memory_ref,
@@ -242,6 +240,9 @@ async def execute_pipeline(state: RunState) -> None:
     except GitCommandError as exc:
         logger.exception("Git operation failed")
         state.fail(f"Git error: {exc}")
+    except GitHubAPIError as exc:
+        logger.exception("GitHub API request failed")
+        state.fail(f"GitHub API error: {exc}")
     except Exception as exc:
         logger.exception("Pipeline failed")
         state.fail(str(exc))
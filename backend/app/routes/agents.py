@@ -10,7 +10,6 @@ GET  /runs               – list all runs
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import uuid
 
@@ -94,10 +93,8 @@ async def get_status(run_id: str):
     if state is None:
         raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
 
-    # Filter git-specific progress entries for the frontend
-    git_ops = [
-        p for p in state.progress if p.get("agent") == "github"
-    ]
+    # Git-specific progress entries for the frontend
+    git_ops = list(state.git_operations)
 
     return {
         "run_id": state.run_id,
@@ -156,7 +153,8 @@ async def get_results(run_id: str):
 async def stream_status(run_id: str):
     """Stream progress updates as Server-Sent Events (SSE).
 
-    Each event is a JSON-encoded snapshot of the current RunState.
+    Each event is a JSON-encoded snapshot of the current RunState,
+    serialised once per state change and shared across listeners.
     The stream closes automatically once the run reaches a terminal state
     (completed / failed).
     """
@@ -180,19 +178,15 @@ async def _event_generator(state: RunState):
     """Yield SSE-formatted events whenever the run state changes."""
 
     while True:
-        snapshot = state.to_dict()
-        yield f"data: {json.dumps(snapshot)}\n\n"
+        seen = state.version
+        yield state.sse_frame()
 
         # Terminal states → close the stream
         if state.status in ("completed", "failed"):
             return
 
         # Wait for the next state change (or poll every 2 s as fallback)
-        try:
-            await asyncio.wait_for(state._event.wait(), timeout=2.0)
-            state._event.clear()  # reset so we block again on next iteration
-        except asyncio.TimeoutError:
-            pass  # heartbeat: re-send current snapshot
+        await state.wait_for_update(seen, timeout=2.0)
 
 
 # ── GET /runs ────────────────────────────────────────────────────────
@@ -15,7 +15,7 @@ async def get_results():
     """Return the current contents of results.json."""
     if not RESULTS_PATH.exists():
         return {"runs": []}
-    return json.loads(RESULTS_PATH.read_text())
+    return json.loads(RESULTS_PATH.read_bytes())
 
 
 @router.get("/{job_id}")
@@ -23,7 +23,7 @@ async def get_result_by_job(job_id: str):
     """Return results for a specific job."""
     if not RESULTS_PATH.exists():
         raise HTTPException(status_code=404, detail="No results found")
-    data = json.loads(RESULTS_PATH.read_text())
+    data = json.loads(RESULTS_PATH.read_bytes())
     for run in data.get("runs", []):
         if run.get("job_id") == job_id:
             return run
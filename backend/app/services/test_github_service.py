@@ -0,0 +1,78 @@
+"""Unit tests for GitHubService git plumbing (no network, no GitHub).
+
+Run:
+    python3 -m pytest backend/app/services/test_github_service.py -v
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+_BACKEND = Path(__file__).resolve().parents[2]
+if str(_BACKEND) not in sys.path:
+    sys.path.insert(0, str(_BACKEND))
+
+from app.services import github_service
+from app.services.github_service import GitCommandError, GitHubAPIError, GitHubService
+
+
+class TestCloneCache:
+    def test_checkout_passes_credentials_to_every_remote_command(self, tmp_path: Path):
+        cache = tmp_path / "cache" / "o" / "r.git"
+        work = tmp_path / "work"
+        calls: list[tuple[list[str], Any]] = []
+
+        def fake_run_git(args, cwd, timeout=120, stream=False, env=None):
+            calls.append((args, env))
+            if args[0] == "clone":
+                cache.mkdir(parents=True)
+            elif args[0] == "worktree":
+                work.mkdir()
+                (work / ".gitmodules").write_text("")
+            stdout = "main\n" if args[0] == "symbolic-ref" else ""
+            return subprocess.CompletedProcess(args, 0, stdout=stdout, stderr="")
+
+        with patch.object(github_service, "_run_git", fake_run_git):
+            GitHubService._checkout_from_cache(
+                cache, "https://github.com/o/r.git", "tok", work,
+            )
+
+        envs = {args[0]: env for args, env in calls}
+        for cmd in ("clone", "fetch", "worktree", "submodule"):
+            assert envs[cmd] is not None, cmd
+            assert envs[cmd]["HEAL_GIT_TOKEN"] == "tok"
+        assert all("tok" not in " ".join(args) for args, _ in calls)
+
+
+class TestRunGit:
+    def test_env_is_read_at_call_time(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setenv("HEAL_TEST_MARKER", "late")
+        seen: dict[str, str] = {}
+
+        def fake_run(cmd, **kwargs):
+            seen.update(kwargs["env"])
+            return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+        with patch.object(github_service.subprocess, "run", fake_run):
+            github_service._run_git(["status"], cwd=tmp_path)
+        assert seen["HEAL_TEST_MARKER"] == "late"
+        assert seen["GIT_HTTP_LOW_SPEED_LIMIT"] == "1000"
+
+
+class TestGraphQL:
+    def test_http_failure_is_an_api_error_not_a_git_error(self):
+        svc = GitHubService(token="tok")
+        resp = httpx.Response(502, text="bad gateway")
+        with patch.object(svc, "_post_graphql", return_value=resp):
+            with pytest.raises(GitHubAPIError) as info:
+                svc.repo_snapshot("https://github.com/o/r")
+        assert info.value.status == 502
+        assert not isinstance(info.value, GitCommandError)
+        assert github_service._is_transient(info.value)
@@ -3,16 +3,52 @@
 from __future__ import annotations
 
 import asyncio
+import operator
+import sys
+import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
-
-def _utcnow_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
-@dataclass
+import orjson
+
+_MONOREPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_MONOREPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_MONOREPO_ROOT))
+
+from app.config import settings
+from shared.timestamps import iso_from_ns
+
+
+# Keys exported by RunState.to_dict, in output order
+_SNAPSHOT_KEYS = (
+    "run_id",
+    "repo_url",
+    "team_name",
+    "leader_name",
+    "status",
+    "current_agent",
+    "current_step",
+    "current_iteration",
+    "latest_message",
+    "branch",
+    "iteration_count",
+    "max_iterations",
+    "latest_ci_status",
+    "total_failures_detected",
+    "total_fixes_applied",
+    "runtime_seconds",
+    "progress",
+    "progress_dropped",
+    "result",
+    "created_at",
+    "updated_at",
+)
+_snapshot_values = operator.attrgetter(*_SNAPSHOT_KEYS)
+
+
+@dataclass(slots=True)
 class RunState:
     """Tracks the live state of a single pipeline run."""
 
@@ -22,10 +58,17 @@ class RunState:
     leader_name: str
     status: str = "queued"  # queued | running | completed | failed
     current_agent: str = ""
-    progress: list[dict[str, Any]] = field(default_factory=list)
+    # Ring buffer of the most recent events; progress_dropped counts evictions
+    progress: deque[dict[str, Any]] = field(
+        default_factory=lambda: deque(maxlen=settings.MAX_PROGRESS_EVENTS)
+    )
+    progress_dropped: int = 0
+    # Every "github" progress entry, kept in full (the ring buffer evicts)
+    git_operations: list[dict[str, Any]] = field(default_factory=list)
     result: dict[str, Any] | None = None
-    created_at: str = field(default_factory=_utcnow_iso)
-    updated_at: str = field(default_factory=_utcnow_iso)
+    # Epoch nanoseconds; formatted to ISO strings only when read
+    created_at_ns: int = field(default_factory=time.time_ns)
+    updated_at_ns: int = field(default_factory=time.time_ns)
 
     # ── Live tracking fields (updated as iterations progress) ────────
     branch: str = ""
@@ -42,16 +85,37 @@ class RunState:
     current_iteration: int = 0
     latest_message: str = ""
 
-    # Async event fired every time state changes so SSE listeners wake up
-    _event: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    # Bumped on every state change; SSE listeners wait on _cond until the
+    # version moves past the one they last served.
+    _version: int = field(default=0, repr=False)
+    _cond: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+    _loop: asyncio.AbstractEventLoop | None = field(default=None, repr=False)
+    # SSE frame serialised once per version and shared by all listeners
+    _frame: bytes = field(default=b"", repr=False)
+    _frame_version: int = field(default=-1, repr=False)
+
+    def __post_init__(self) -> None:
+        if self._loop is None:
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+
+    @property
+    def created_at(self) -> str:
+        return iso_from_ns(self.created_at_ns)
+
+    @property
+    def updated_at(self) -> str:
+        return iso_from_ns(self.updated_at_ns)
 
     def push_progress(self, agent_name: str, status: str, message: str = "") -> None:
         self.current_agent = agent_name
         self.status = "running"
         if message:
             self.latest_message = message
-        self.updated_at = _utcnow_iso()
-        self.progress.append(
+        self.updated_at_ns = time.time_ns()
+        self._append_progress(
             {
                 "agent": agent_name,
                 "status": status,
@@ -67,19 +131,19 @@ class RunState:
         self.current_iteration = iteration
         if message:
             self.latest_message = message
-        self.updated_at = _utcnow_iso()
+        self.updated_at_ns = time.time_ns()
         self._notify()
 
     def complete(self, result: dict[str, Any]) -> None:
         self.status = "completed"
         self.result = result
-        self.updated_at = _utcnow_iso()
+        self.updated_at_ns = time.time_ns()
         self._notify()
 
     def fail(self, error: str) -> None:
         self.status = "failed"
-        self.updated_at = _utcnow_iso()
-        self.progress.append(
+        self.updated_at_ns = time.time_ns()
+        self._append_progress(
             {"agent": self.current_agent, "status": "error", "message": error, "timestamp": self.updated_at}
         )
         self._notify()
@@ -97,51 +161,89 @@ class RunState:
             self.latest_ci_status = ci_status
         self.total_failures_detected = failures
         self.total_fixes_applied = fixes
-        self.updated_at = _utcnow_iso()
+        self.updated_at_ns = time.time_ns()
         self._notify()
 
+    def _append_progress(self, entry: dict[str, Any]) -> None:
+        if len(self.progress) == self.progress.maxlen:
+            self.progress_dropped += 1
+        self.progress.append(entry)
+        if entry["agent"] == "github":
+            self.git_operations.append(entry)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
     def _notify(self) -> None:
-        """Wake SSE listeners without the set/clear race condition."""
-        self._event.set()
-        # Do NOT call clear() here — let the listener clear after waking.
+        """Bump the version and wake SSE listeners.
+
+        Safe to call from sync code and worker threads: the broadcast is
+        scheduled onto the loop that owns ``_cond``.
+        """
+        self._version += 1
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(_schedule_broadcast, self)
+
+    def sse_frame(self) -> bytes:
+        """Return the ``data:`` SSE frame for the current version."""
+        version = self._version
+        if self._frame_version != version:
+            payload = orjson.dumps(self.to_dict(), option=orjson.OPT_NON_STR_KEYS)
+            self._frame = b"data: " + payload + b"\n\n"
+            self._frame_version = version
+        return self._frame
+
+    async def _broadcast(self) -> None:
+        async with self._cond:
+            self._cond.notify_all()
+
+    async def wait_for_update(self, seen: int, timeout: float) -> None:
+        """Block until the version exceeds *seen* or *timeout* elapses."""
+        async with self._cond:
+            try:
+                await asyncio.wait_for(
+                    self._cond.wait_for(lambda: self._version > seen), timeout,
+                )
+            except asyncio.TimeoutError:
+                pass
 
     def to_dict(self) -> dict[str, Any]:
-        return {
-            "run_id": self.run_id,
-            "repo_url": self.repo_url,
-            "team_name": self.team_name,
-            "leader_name": self.leader_name,
-            "status": self.status,
-            "current_agent": self.current_agent,
-            "current_step": self.current_step,
-            "current_iteration": self.current_iteration,
-            "latest_message": self.latest_message,
-            "branch": self.branch,
-            "iteration_count": self.iteration_count,
-            "max_iterations": self.max_iterations,
-            "latest_ci_status": self.latest_ci_status,
-            "total_failures_detected": self.total_failures_detected,
-            "total_fixes_applied": self.total_fixes_applied,
-            "runtime_seconds": round(self.runtime_seconds, 2),
-            "progress": self.progress,
-            "result": self.result,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at,
-        }
+        snapshot = dict(zip(_SNAPSHOT_KEYS, _snapshot_values(self)))
+        snapshot["runtime_seconds"] = round(self.runtime_seconds, 2)
+        snapshot["progress"] = list(self.progress)
+        return snapshot
+
+
+# Strong references so pending broadcast tasks aren't garbage-collected
+_broadcast_tasks: set[asyncio.Task] = set()
+
+
+def _schedule_broadcast(state: RunState) -> None:
+    task = asyncio.ensure_future(state._broadcast())
+    _broadcast_tasks.add(task)
+    task.add_done_callback(_broadcast_tasks.discard)
 
 
 # ── Global in-memory store ──────────────────────────────────────────
-_runs: dict[str, RunState] = {}
+# LRU: the least recently accessed run is evicted beyond MAX_STORED_RUNS
+_runs: OrderedDict[str, RunState] = OrderedDict()
 
 
 def create_run(run_id: str, repo_url: str, team_name: str, leader_name: str) -> RunState:
     state = RunState(run_id=run_id, repo_url=repo_url, team_name=team_name, leader_name=leader_name)
     _runs[run_id] = state
+    while len(_runs) > settings.MAX_STORED_RUNS:
+        _runs.popitem(last=False)
     return state
 
 
 def get_run(run_id: str) -> RunState | None:
-    return _runs.get(run_id)
+    state = _runs.get(run_id)
+    if state is not None:
+        _runs.move_to_end(run_id)
+    return state
 
 
 def all_runs() -> list[dict[str, Any]]:
@@ -0,0 +1,34 @@
+"""Unit tests for the in-memory run store.
+
+Run:
+    python3 -m pytest backend/app/test_store.py -v
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+_BACKEND = Path(__file__).resolve().parents[1]
+if str(_BACKEND) not in sys.path:
+    sys.path.insert(0, str(_BACKEND))
+
+from app.config import settings
+from app.store import RunState
+
+
+class TestRunState:
+    def test_git_operations_survive_progress_eviction(self):
+        state = RunState(run_id="r", repo_url="u", team_name="t", leader_name="l")
+        state.push_progress("github", "success", "Cloned")
+        state.push_progress("github", "success", "Created branch")
+        for i in range(settings.MAX_PROGRESS_EVENTS + 10):
+            state.push_progress("test_runner", "running", f"event {i}")
+        state.push_progress("github", "success", "PR created")
+
+        assert len(state.progress) == settings.MAX_PROGRESS_EVENTS
+        assert all(p["agent"] != "github" for p in list(state.progress)[:-1])
+        assert state.progress_dropped == 13
+        assert [op["message"] for op in state.git_operations] == [
+            "Cloned", "Created branch", "PR created",
+        ]
@@ -1,20 +1,22 @@
 import sys
 try:
-    import pypdf
-    with open(sys.argv[1], "rb") as f:
-        reader = pypdf.PdfReader(f)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        print(text)
+    import pymupdf
+    with pymupdf.open(sys.argv[1]) as doc:
+        sys.stdout.write("\n".join(page.get_text() for page in doc) + "\n")
 except ImportError:
     try:
-        import PyPDF2
-        with open(sys.argv[1], "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            print(text)
+        import pypdf as pdf_lib
     except ImportError:
-        print("Please install pypdf or PyPDF2")
+        try:
+            import PyPDF2 as pdf_lib
+        except ImportError:
+            pdf_lib = None
+
+    if pdf_lib is None:
+        print("Please install pymupdf, pypdf or PyPDF2")
+    else:
+        with open(sys.argv[1], "rb") as f:
+            reader = pdf_lib.PdfReader(f)
+            parts = [page.extract_text() for page in reader.pages]
+        sys.stdout.write("\n".join(parts) + "\n")
+sys.stdout.flush()
@@ -8,16 +8,28 @@ Lifecycle:
   5. Capture stdout, stderr, exit_code
   6. Destroy the container (always, even on failure)
 
+With ``SANDBOX_POOL_SIZE`` > 0 steps 1 and 6 are replaced by a warm pool:
+a pre-started container is borrowed, the repo is streamed into its
+/workspace volume, and the volume is wiped and the container returned to
+the pool afterwards.  Containers that installed dependencies, kept stray
+processes, or changed files outside /workspace and /tmp are destroyed
+instead, so nothing carries over into another repo's run.
+
 Requires:  docker (pip install docker)  +  Docker daemon running.
 """
 
 from __future__ import annotations
 
+import atexit
+import hashlib
 import logging
+import operator
 import os
+import tarfile
+import threading
 import time
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Iterator
 
 import docker
 from docker.errors import (
@@ -43,7 +55,8 @@ class ExecutionResult:
     logs: str = ""               # combined stdout+stderr stream
     timed_out: bool = False
     duration_s: float = 0.0
-    dependency_install: str = ""  # stdout of the install step
+    # Install-step output; kept as raw bytes on success and decoded on export.
+    dependency_install: str | bytes = ""
     errors: list[str] = field(default_factory=list)
 
     @property
@@ -51,17 +64,30 @@ class ExecutionResult:
         return self.exit_code == 0 and not self.timed_out
 
     def to_dict(self) -> dict[str, Any]:
-        return {
-            "exit_code": self.exit_code,
-            "stdout": self.stdout,
-            "stderr": self.stderr,
-            "logs": self.logs,
-            "timed_out": self.timed_out,
-            "duration_s": round(self.duration_s, 2),
-            "dependency_install": self.dependency_install,
-            "errors": self.errors,
-            "success": self.success,
-        }
+        out = dict(zip(_RESULT_KEYS, _result_values(self)))
+        out["duration_s"] = round(self.duration_s, 2)
+        out["dependency_install"] = _as_text(self.dependency_install)
+        out["success"] = self.success
+        return out
+
+
+# Field order of ExecutionResult.to_dict(); duration_s and
+# dependency_install are normalised after the bulk attribute fetch.
+_RESULT_KEYS = (
+    "exit_code",
+    "stdout",
+    "stderr",
+    "logs",
+    "timed_out",
+    "duration_s",
+    "dependency_install",
+    "errors",
+)
+_result_values = operator.attrgetter(*_RESULT_KEYS)
+
+
+def _as_text(data: str | bytes) -> str:
+    return data.decode("utf-8", errors="replace") if isinstance(data, bytes) else data
 
 
 # ── Dependency detection helpers ─────────────────────────────────────
@@ -76,21 +102,24 @@ DEP_INSTALL_COMMANDS: list[tuple[str, str]] = [
 ]
 
 
+_SENTINELS: tuple[tuple[str, str], ...] = tuple(DEP_INSTALL_COMMANDS)
+_SENTINEL_NAMES: frozenset[str] = frozenset(name for name, _ in _SENTINELS)
+
+
 def _build_install_script(dep_files: list[str]) -> str | None:
     """Return a shell snippet that installs every detected dependency set."""
     parts: list[str] = []
     has_python = False
-    
-    for sentinel, cmd in DEP_INSTALL_COMMANDS:
-        if sentinel in dep_files:
+    present = _SENTINEL_NAMES.intersection(dep_files)
+
+    for sentinel, cmd in _SENTINELS:
+        if sentinel in present:
             parts.append(f'echo ">>> Installing from {sentinel}" && {cmd}')
             if "pip" in cmd:
                 has_python = True
 
     # Check if there are python files to ensure we have pytest
-    has_py_files = any(f.endswith(".py") for f in dep_files)
-    
-    if has_python or has_py_files:
+    if has_python or any(f.endswith(".py") for f in dep_files):
         parts.append('echo ">>> Installing pytest" && pip install --no-cache-dir pytest')
 
     if not parts:
@@ -98,6 +127,369 @@ def _build_install_script(dep_files: list[str]) -> str | None:
     return " && ".join(parts)
 
 
+# Installs that depend only on the listed requirements, never on the repo's
+# own source or on files outside the workspace.  Only these (plus pytest)
+# go into a cached dependency image; project installs (``pip install .``,
+# ``npm install`` into the bind-mounted node_modules) always run.
+_CACHEABLE_SENTINELS: frozenset[str] = frozenset({"requirements.txt", "Pipfile"})
+
+
+def _split_install_script(dep_files: list[str]) -> tuple[str | None, str | None]:
+    """Split the install into ``(cacheable, project)`` shell snippets.
+
+    Same steps as :func:`_build_install_script`, with the requirements-only
+    installs and pytest first so they can be committed as one layer.
+    """
+    present = _SENTINEL_NAMES.intersection(dep_files)
+    cacheable: list[str] = []
+    project: list[str] = []
+    has_python = False
+    for sentinel, cmd in _SENTINELS:
+        if sentinel in present:
+            step = f'echo ">>> Installing from {sentinel}" && {cmd}'
+            (cacheable if sentinel in _CACHEABLE_SENTINELS else project).append(step)
+            if "pip" in cmd:
+                has_python = True
+    if has_python or any(f.endswith(".py") for f in dep_files):
+        cacheable.append('echo ">>> Installing pytest" && pip install --no-cache-dir pytest')
+    return (" && ".join(cacheable) or None, " && ".join(project) or None)
+
+
+def _is_pure_requirements(sentinel: str, text: str) -> bool:
+    """True if *text* names only index/VCS packages, nothing on local disk.
+
+    Nested requirement/constraint files, editable installs and local paths
+    would make the install depend on files the digest doesn't cover.
+    """
+    if sentinel == "Pipfile":
+        return "path" not in text
+    for raw in text.splitlines():
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith(("-r", "--requirement", "-c", "--constraint", "-e", "--editable")):
+            return False
+        if line.startswith((".", "/", "~")) or "file:" in line:
+            return False
+        if "/" in line and "://" not in line:
+            return False
+    return True
+
+
+def _build_detect_and_install_script() -> str:
+    """Shell script that detects dep files *inside* /workspace and installs.
+
+    Equivalent to ``ls`` + :func:`_build_install_script` but needs only one
+    ``docker exec``.  Prints nothing when there is nothing to install.
+    """
+    lines = ["py=0"]
+    for sentinel, cmd in DEP_INSTALL_COMMANDS:
+        mark_py = " py=1;" if "pip" in cmd else ""
+        lines.append(
+            f'if [ -e {sentinel} ]; then echo ">>> Installing from {sentinel}" '
+            f"&& {cmd} || exit $?;{mark_py} fi"
+        )
+    lines.append(
+        'if [ "$py" = 1 ] || ls *.py >/dev/null 2>&1; then '
+        'echo ">>> Installing pytest" && pip install --no-cache-dir pytest || exit $?; fi'
+    )
+    return "\n".join(lines)
+
+
+DETECT_AND_INSTALL_SCRIPT = _build_detect_and_install_script()
+
+
+def _list_repo_files(repo_path: str) -> list[str] | None:
+    """Names of regular files at the repo root, read on the host.
+
+    /workspace is a copy or bind mount of *repo_path*, so this avoids a
+    ``docker exec`` round-trip.  Returns ``None`` if the path is unreadable.
+    """
+    try:
+        with os.scandir(repo_path) as it:
+            return [entry.name for entry in it if entry.is_file()]
+    except OSError:
+        return None
+
+
+# ── Shared Docker client ─────────────────────────────────────────────
+
+# One client (and one connection pool to the daemon socket) per process;
+# executors are constructed per call, so per-instance clients leak FDs.
+_GLOBAL_CLIENT: docker.DockerClient | None = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> docker.DockerClient:
+    """Return the process-wide Docker client, creating it on first use."""
+    global _GLOBAL_CLIENT
+    if _GLOBAL_CLIENT is None:
+        with _client_lock:
+            if _GLOBAL_CLIENT is None:
+                _GLOBAL_CLIENT = docker.from_env()
+    return _GLOBAL_CLIENT
+
+
+def _close_client() -> None:
+    global _GLOBAL_CLIENT
+    with _client_lock:
+        client, _GLOBAL_CLIENT = _GLOBAL_CLIENT, None
+    if client is not None:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+# Registered before the pool so it runs after the pool's atexit cleanup.
+atexit.register(_close_client)
+
+
+# ── Create/start throttle ────────────────────────────────────────────
+
+# Bursts of parallel container creates make some daemons race and fail.
+# Creates run inside worker threads, so a thread semaphore bounds them.
+_CREATE_SEM = threading.BoundedSemaphore(int(os.getenv("SANDBOX_MAX_PARALLEL", "10")))
+
+
+# ── Dependency-layer cache ───────────────────────────────────────────
+
+DEP_CACHE_REPO = "sandbox-cache"
+DEP_CACHE_LABEL = "sandbox-cache"
+DEP_CACHE_MAX_IMAGES = int(os.getenv("SANDBOX_DEP_CACHE_SIZE", "8"))
+
+
+def _dep_digest(repo_path: str, base_image: str) -> str | None:
+    """Content hash of the base image, cacheable install script and files.
+
+    Covers only the requirements-only part of the install (see
+    :func:`_split_install_script`), so two repos with the same digest get
+    an identical ``sandbox-cache:<digest>`` layer.  Returns ``None`` when
+    there is nothing cacheable, or when a requirements file references
+    local paths or other files (the digest couldn't cover those).
+    """
+    names = _list_repo_files(repo_path)
+    if names is None:
+        return None
+    script, _ = _split_install_script(names)
+    if script is None:
+        return None
+
+    h = hashlib.sha256(f"{base_image}\0{script}".encode())
+    present = _CACHEABLE_SENTINELS.intersection(names)
+    if "Pipfile" in present and "Pipfile.lock" in names:
+        present = present | {"Pipfile.lock"}
+    for sentinel in sorted(present):
+        try:
+            with open(os.path.join(repo_path, sentinel), "rb") as fh:
+                data = fh.read()
+        except OSError:
+            return None  # unreadable → don't risk a wrong cache hit
+        if not _is_pure_requirements(sentinel, data.decode("utf-8", errors="replace")):
+            return None
+        h.update(sentinel.encode() + b"\0" + data)
+    return h.hexdigest()
+
+
+def _evict_dep_cache(client: docker.DockerClient) -> None:
+    """Remove the oldest cached dependency images beyond the size limit."""
+    try:
+        images = client.images.list(filters={"label": f"managed-by={DEP_CACHE_LABEL}"})
+    except Exception as exc:
+        logger.debug("Could not list dep-cache images: %s", exc)
+        return
+    images.sort(key=lambda img: img.attrs.get("Created", ""), reverse=True)
+    for img in images[DEP_CACHE_MAX_IMAGES:]:
+        try:
+            client.images.remove(img.id)
+            logger.info("Evicted dep-cache image %s", img.short_id)
+        except Exception as exc:
+            logger.debug("Could not evict %s: %s", img.short_id, exc)
+
+
+# ── Warm container pool ──────────────────────────────────────────────
+
+POOL_LABEL = "self-healing-sandbox-pool"
+
+# Wipes /workspace (including dotfiles) and /tmp between pooled runs.
+_RESET_WORKSPACE = ["find", "/workspace", "/tmp", "-mindepth", "1", "-delete"]
+
+# SIGKILLs everything but PID 1 and this shell, then prints any survivor
+# (including zombies re-parented to PID 1).  Any output → don't reuse.
+_KILL_STRAYS = [
+    "sh", "-c",
+    "kill -9 -1 2>/dev/null; sleep 0.2; "
+    'for p in /proc/[0-9]*; do n=${p#/proc/}; '
+    '[ "$n" = 1 ] || [ "$n" = $$ ] || echo "$n"; done',
+]
+
+# Paths a pooled run may leave changed in the container filesystem.
+_RESETTABLE_PATHS = ("/workspace", "/tmp")
+_RESETTABLE_PREFIXES = tuple(f"{path}/" for path in _RESETTABLE_PATHS)
+
+
+class _ContainerPool:
+    """Idle pre-started containers keyed by (image, mem_limit, cpu_limit).
+
+    Runs happen in worker threads (``asyncio.to_thread``), so the pool is
+    guarded by a ``threading.Lock`` rather than an asyncio primitive.
+    """
+
+    def __init__(self, max_idle: int):
+        self.max_idle = max_idle
+        self._idle: dict[tuple[str, str, float], list[Container]] = {}
+        self._volumes: dict[str, Any] = {}  # container id → /workspace volume
+        self._lock = threading.Lock()
+
+    def acquire(
+        self, client: docker.DockerClient, key: tuple[str, str, float]
+    ) -> Container:
+        """Pop a warm container for *key*, or create and start a new one."""
+        with self._lock:
+            idle = self._idle.get(key)
+            container = idle.pop() if idle else None
+        if container is not None:
+            return container
+
+        image, mem_limit, cpu_limit = key
+        # A named volume backs /workspace: the repo is streamed into it per
+        # run, and it stays out of the image layer and container diff.
+        volume = client.volumes.create(labels={"managed-by": POOL_LABEL})
+        try:
+            with _CREATE_SEM:
+                container = client.containers.create(
+                    image=image,
+                    command="sleep infinity",
+                    working_dir="/workspace",
+                    volumes={volume.name: {"bind": "/workspace", "mode": "rw"}},
+                    mem_limit=mem_limit,
+                    nano_cpus=int(cpu_limit * 1e9),
+                    labels={"managed-by": POOL_LABEL},
+                    detach=True,
+                )
+                container.start()
+        except Exception:
+            _remove_volume(volume)
+            raise
+        with self._lock:
+            self._volumes[container.id] = volume
+        logger.info("Pool container %s started (image=%s)", container.short_id, image)
+        return container
+
+    def release(
+        self,
+        key: tuple[str, str, float],
+        container: Container,
+        networks: list[str] | None = None,
+        reusable: bool = True,
+    ) -> None:
+        """Kill stray processes, wipe /workspace, reattach *networks* and park.
+
+        Containers that are not *reusable* (they ran a dependency install),
+        that still have processes after the kill, that changed anything
+        outside /workspace and /tmp (site-packages, $HOME, /etc), that
+        cannot be reset, or that would exceed ``max_idle`` are destroyed
+        instead.  Networks are only reattached once the reset is clean.
+        """
+        if not reusable:
+            self._discard(container)
+            return
+        try:
+            strays = container.exec_run(_KILL_STRAYS)
+            if strays.exit_code != 0 or strays.output.strip():
+                raise RuntimeError("processes survived the run")
+            if container.exec_run(_RESET_WORKSPACE).exit_code != 0:
+                raise RuntimeError("workspace reset failed")
+            changed = [
+                change["Path"] for change in container.diff() or ()
+                if change["Path"] not in _RESETTABLE_PATHS
+                and not change["Path"].startswith(_RESETTABLE_PREFIXES)
+            ]
+            if changed:
+                raise RuntimeError(f"filesystem changed outside workspace: {changed[:3]}")
+            for net_name in networks or ():
+                container.client.networks.get(net_name).connect(container)
+        except Exception as exc:
+            logger.warning("Dropping pool container %s: %s", container.short_id, exc)
+            self._discard(container)
+            return
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(container)
+                return
+        self._discard(container)
+
+    def _discard(self, container: Container) -> None:
+        """Destroy *container* and its /workspace volume.  Never raises."""
+        with self._lock:
+            volume = self._volumes.pop(container.id, None)
+        SandboxExecutor._destroy(container)
+        if volume is not None:
+            _remove_volume(volume)
+
+    def close(self) -> None:
+        """Destroy every idle container."""
+        with self._lock:
+            containers = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for container in containers:
+            self._discard(container)
+
+
+def _remove_volume(volume: Any) -> None:
+    try:
+        volume.remove(force=True)
+    except Exception as exc:
+        logger.debug("Could not remove volume %s: %s", volume.name, exc)
+
+
+_POOL = _ContainerPool(int(os.getenv("SANDBOX_POOL_SIZE", "0")))
+atexit.register(_POOL.close)
+
+
+# Images confirmed present locally (the answer never changes in-process).
+_ready_images: set[str] = set()
+
+# One background pull per image, shared by every executor in the process.
+_image_warmers: dict[str, threading.Thread] = {}
+_image_warmers_lock = threading.Lock()
+
+
+class _ChunkSink:
+    """Write-only file object that collects what tarfile emits."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> list[bytes]:
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+
+def _tar_stream(path: str) -> Iterator[bytes]:
+    """Yield *path* as a tar stream for ``put_archive``.
+
+    The archive is produced in ``w|`` (stream) mode file by file, so the
+    repo is never materialised as one in-memory or on-disk tarball.
+    """
+    sink = _ChunkSink()
+    with tarfile.open(fileobj=sink, mode="w|") as tf:
+        for root, dirs, files in os.walk(path):
+            rel_root = os.path.relpath(root, path)
+            for name in dirs + files:
+                full = os.path.join(root, name)
+                arcname = os.path.normpath(os.path.join(rel_root, name))
+                tf.add(full, arcname=arcname, recursive=False)
+                yield from sink.drain()
+    yield from sink.drain()
+
+
 # ── Core executor ────────────────────────────────────────────────────
 
 class SandboxExecutor:
@@ -127,15 +519,42 @@ class SandboxExecutor:
         self.cpu_limit = cpu_limit or float(os.getenv("SANDBOX_CPU_LIMIT", "1.0"))
         self.network_disabled = network_disabled
 
-        self._client: docker.DockerClient | None = None
+        self._pull_thread = self._start_image_warmup()
 
-    # -- Docker client (lazy) ------------------------------------------
+    # -- Docker client (shared, lazy) ----------------------------------
 
     @property
     def client(self) -> docker.DockerClient:
-        if self._client is None:
-            self._client = docker.from_env()
-        return self._client
+        return _get_client()
+
+    # -- Image warm-up (background) ------------------------------------
+
+    def _start_image_warmup(self) -> threading.Thread:
+        """Start pulling ``self.image`` in a daemon thread (once per image)."""
+        with _image_warmers_lock:
+            thread = _image_warmers.get(self.image)
+            if thread is None:
+                thread = threading.Thread(
+                    target=self._warm_image,
+                    name=f"sandbox-pull:{self.image}",
+                    daemon=True,
+                )
+                _image_warmers[self.image] = thread
+                thread.start()
+        return thread
+
+    def _warm_image(self) -> None:
+        try:
+            self._ensure_image()
+        except Exception as exc:
+            # Surfaced properly by the _ensure_image() call in the run path.
+            logger.debug("Background pull of %s failed: %s", self.image, exc)
+
+    async def await_ready(self) -> None:
+        """Wait for the background image pull started in ``__init__``."""
+        import asyncio
+
+        await asyncio.to_thread(self._pull_thread.join)
 
     # -- Public API ----------------------------------------------------
 
@@ -161,37 +580,50 @@ class SandboxExecutor:
         test_command: str,
         install_deps: bool,
     ) -> ExecutionResult:
+        if _POOL.max_idle > 0:
+            return self._run_tests_pooled(repo_path, test_command, install_deps)
+
         container: Container | None = None
         t0 = time.monotonic()
 
         try:
-            # ── 1. Pull image if missing ─────────────────────────────
+            # ── 1. Pull image if missing (usually done by warm-up) ──
+            self._pull_thread.join()
             self._ensure_image()
+            digest, image, install_deps = self._resolve_dep_cache(
+                repo_path, install_deps
+            )
 
             # ── 2. Create container (do NOT start yet) ───────────────
-            container = self.client.containers.create(
-                image=self.image,
-                command="sleep infinity",      # keep alive for exec
-                working_dir="/workspace",
-                volumes={
-                    os.path.abspath(repo_path): {
-                        "bind": "/workspace",
-                        "mode": "rw",
-                    }
-                },
-                mem_limit=self.memory_limit,
-                nano_cpus=int(self.cpu_limit * 1e9),
-                network_disabled=self.network_disabled if not install_deps else False,
-                labels={"managed-by": "self-healing-sandbox"},
-                detach=True,
-            )
-            container.start()
-            logger.info("Container %s started (image=%s)", container.short_id, self.image)
+            with _CREATE_SEM:
+                container = self.client.containers.create(
+                    image=image,
+                    command="sleep infinity",      # keep alive for exec
+                    working_dir="/workspace",
+                    volumes={
+                        os.path.abspath(repo_path): {
+                            "bind": "/workspace",
+                            "mode": "rw",
+                        }
+                    },
+                    mem_limit=self.memory_limit,
+                    nano_cpus=int(self.cpu_limit * 1e9),
+                    network_disabled=self.network_disabled if not install_deps else False,
+                    labels={"managed-by": "self-healing-sandbox"},
+                    detach=True,
+                )
+                container.start()
+            logger.info("Container %s started (image=%s)", container.short_id, image)
 
             # ── 3. Detect & install dependencies ─────────────────────
-            dep_install_log = ""
+            cached = image != self.image
+            dep_install_log: str | bytes = (
+                "(dependencies restored from cache)" if cached else ""
+            )
             if install_deps:
-                dep_install_log = self._install_dependencies(container)
+                dep_install_log, _ = self._install_dependencies(
+                    container, repo_path, digest, cached=cached
+                )
 
             # Disable network after install for test safety
             if install_deps and self.network_disabled:
@@ -203,13 +635,12 @@ class SandboxExecutor:
             )
 
             duration = time.monotonic() - t0
-            logs = self._fetch_logs(container)
 
             return ExecutionResult(
                 exit_code=exit_code,
                 stdout=stdout,
                 stderr=stderr,
-                logs=logs,
+                logs=f"{stdout}\n{stderr}",
                 timed_out=timed_out,
                 duration_s=duration,
                 dependency_install=dep_install_log,
@@ -225,55 +656,266 @@ class SandboxExecutor:
             # ── 5. ALWAYS destroy the container ──────────────────────
             self._destroy(container)
 
+    def _run_tests_pooled(
+        self,
+        repo_path: str,
+        test_command: str,
+        install_deps: bool,
+    ) -> ExecutionResult:
+        """Pool-mode variant of :meth:`_run_tests_sync`.
+
+        Borrows a warm container, copies *repo_path* into /workspace via
+        ``put_archive`` (bind mounts can't change on a running container)
+        and hands the container back to the pool instead of destroying it,
+        unless it installed dependencies.  On a dep-cache hit the pool key
+        is the ``sandbox-cache:<digest>`` image, so warm containers are only
+        shared between identical environments.
+        """
+        key = (self.image, self.memory_limit, self.cpu_limit)
+        container: Container | None = None
+        disconnected: list[str] = []
+        reusable = True
+        t0 = time.monotonic()
+
+        try:
+            self._pull_thread.join()
+            self._ensure_image()
+            digest, image, install_deps = self._resolve_dep_cache(
+                repo_path, install_deps
+            )
+            cached = image != self.image
+            key = (image, self.memory_limit, self.cpu_limit)
+            container = _POOL.acquire(self.client, key)
+            container.put_archive("/workspace", _tar_stream(os.path.abspath(repo_path)))
+
+            # Pooled containers aren't committed, and one that installs
+            # anything is dropped afterwards rather than handed to an
+            # unrelated repo.
+            dep_install_log: str | bytes = (
+                "(dependencies restored from cache)" if cached else ""
+            )
+            if install_deps:
+                reusable = False
+                dep_install_log, _ = self._install_dependencies(
+                    container, repo_path, digest if cached else None, cached=cached
+                )
+
+            # Pooled containers keep their network for the next install,
+            # so isolate whenever the executor asks for it.
+            if self.network_disabled:
+                container.reload()
+                disconnected = list(
+                    container.attrs.get("NetworkSettings", {}).get("Networks", {})
+                )
+                self._disconnect_network(container)
+
+            stdout, stderr, exit_code, timed_out = self._exec_in_container(
+                container, test_command
+            )
+
+            return ExecutionResult(
+                exit_code=exit_code,
+                stdout=stdout,
+                stderr=stderr,
+                logs=f"{stdout}\n{stderr}",
+                timed_out=timed_out,
+                duration_s=time.monotonic() - t0,
+                dependency_install=dep_install_log,
+            )
+
+        except ImageNotFound:
+            return self._error_result(t0, f"Docker image '{self.image}' not found")
+        except APIError as exc:
+            return self._error_result(t0, f"Docker API error: {exc.explanation}")
+        except Exception as exc:
+            return self._error_result(t0, str(exc))
+        finally:
+            if container is not None:
+                _POOL.release(key, container, disconnected, reusable)
+
     # -- Execute a command inside a running container -------------------
 
     def _exec_in_container(
         self, container: Container, command: str
     ) -> tuple[str, str, int, bool]:
         """Run *command* via `docker exec` and return (stdout, stderr, exit_code, timed_out)."""
-        timed_out = False
+        out, err, exit_code, timed_out = self._exec_raw(container, command)
+        return (
+            out.decode("utf-8", errors="replace"),
+            err.decode("utf-8", errors="replace"),
+            exit_code,
+            timed_out,
+        )
+
+    def _exec_raw(
+        self, container: Container, command: str
+    ) -> tuple[bytes, bytes, int, bool]:
+        """Like :meth:`_exec_in_container` but leaves both streams as bytes.
+
+        Output is streamed from the daemon chunk by chunk into byte buffers
+        and decoded once at the end.  A watchdog kills every process in the
+        container except PID 1 (``sleep infinity``) once ``self.timeout``
+        elapses, which ends the stream.
+        """
+        timed_out = threading.Event()
+
+        def _kill() -> None:
+            timed_out.set()
+            try:
+                # `kill` is a shell builtin; slim images ship no pkill.
+                container.exec_run(["sh", "-c", "kill -9 -1"])
+            except Exception as exc:
+                logger.warning("Could not kill timed-out exec: %s", exc)
+
+        watchdog = threading.Timer(self.timeout, _kill)
+        watchdog.daemon = True
         try:
-            exec_result = container.exec_run(
+            api = container.client.api
+            exec_id = api.exec_create(
+                container.id,
                 cmd=["sh", "-c", command],
                 workdir="/workspace",
-                demux=True,                 # separate stdout / stderr
-                environment={"PYTHONDONTWRITEBYTECODE": "1"},
+                environment={
+                    "PYTHONDONTWRITEBYTECODE": "1",
+                    "PYTHONUNBUFFERED": "1",
+                },
+            )["Id"]
+
+            out_buf = bytearray()
+            err_buf = bytearray()
+            watchdog.start()
+            for out_chunk, err_chunk in api.exec_start(exec_id, stream=True, demux=True):
+                if out_chunk:
+                    out_buf += out_chunk
+                if err_chunk:
+                    err_buf += err_chunk
+            watchdog.cancel()
+
+            exit_code = api.exec_inspect(exec_id)["ExitCode"]
+            if timed_out.is_set():
+                err_buf += f"\n[sandbox] command timed out after {self.timeout}s\n".encode()
+            return (
+                bytes(out_buf),
+                bytes(err_buf),
+                exit_code if exit_code is not None else 1,
+                timed_out.is_set(),
             )
 
-            raw_stdout = (exec_result.output[0] or b"").decode("utf-8", errors="replace") if exec_result.output else ""
-            raw_stderr = (exec_result.output[1] or b"").decode("utf-8", errors="replace") if exec_result.output and len(exec_result.output) > 1 else ""
-            exit_code = exec_result.exit_code
-
-            return raw_stdout, raw_stderr, exit_code, False
-
         except Exception as exc:
             err_msg = str(exc).lower()
-            timed_out = "timeout" in err_msg or "timed out" in err_msg
-            return "", str(exc), 1, timed_out
+            is_timeout = (
+                timed_out.is_set() or "timeout" in err_msg or "timed out" in err_msg
+            )
+            return b"", str(exc).encode(), 1, is_timeout
+        finally:
+            watchdog.cancel()
 
     # -- Dependency installation ---------------------------------------
 
-    def _install_dependencies(self, container: Container) -> str:
-        """Detect dependency files in /workspace and install them."""
-        # List files at repo root
-        ls_result = container.exec_run(
-            cmd=["ls", "/workspace"], demux=True
-        )
-        file_list = (ls_result.output[0] or b"").decode().split()
-
-        script = _build_install_script(file_list)
-        if script is None:
+    def _install_dependencies(
+        self,
+        container: Container,
+        repo_path: str,
+        digest: str | None = None,
+        cached: bool = False,
+    ) -> tuple[str | bytes, bool]:
+        """Detect dependency files in *repo_path* and install them in the container.
+
+        With a *digest*, the requirements-only layer is installed first and
+        committed as ``sandbox-cache:<digest>`` (or, if *cached*, is already
+        in the image); the project install (``pip install .``,
+        ``npm install``) then always runs on top against the current tree.
+
+        Returns ``(log, succeeded)``.  A successful install's log stays as
+        bytes (decoded only if exported); a failed one is decoded for the
+        warning.
+        """
+        file_list = _list_repo_files(repo_path)
+        if file_list is None:
+            # Host listing failed: let the container detect and install.
+            return self._run_install(container, DETECT_AND_INSTALL_SCRIPT)
+        if digest is None:
+            script = _build_install_script(file_list)
+            if script is None:
+                logger.info("No dependency files detected – skipping install")
+                return "(no dependency files detected)", False
+            return self._run_install(container, script)
+
+        base, project = _split_install_script(file_list)
+        logs: list[bytes] = []
+        if cached:
+            logs.append(b"(dependencies restored from cache)")
+        elif base is not None:
+            log, ok = self._run_install(container, base)
+            if not ok:
+                return log, False
+            self._store_dep_cache(container, digest)
+            logs.append(log if isinstance(log, bytes) else log.encode())
+        if project is not None:
+            log, ok = self._run_install(container, project)
+            if not ok:
+                return log, False
+            logs.append(log if isinstance(log, bytes) else log.encode())
+        return b"\n".join(logs), True
+
+    def _run_install(
+        self, container: Container, script: str
+    ) -> tuple[str | bytes, bool]:
+        """Run one install *script*; see :meth:`_install_dependencies`."""
+        logger.info("Installing dependencies: %s", script)
+        stdout, stderr, code, _ = self._exec_raw(container, script)
+        if code == 0 and not stdout.strip() and not stderr.strip():
             logger.info("No dependency files detected – skipping install")
-            return "(no dependency files detected)"
+            return "(no dependency files detected)", False
 
-        logger.info("Installing dependencies: %s", script)
-        stdout, stderr, code, _ = self._exec_in_container(container, script)
-        combined = f"STDOUT:\n{stdout}\nSTDERR:\n{stderr}"
+        if code == 0:
+            return b"".join((b"STDOUT:\n", stdout, b"\nSTDERR:\n", stderr)), True
+
+        logger.warning("Dependency install exited with code %d", code)
+        return f"STDOUT:\n{_as_text(stdout)}\nSTDERR:\n{_as_text(stderr)}", False
+
+    # -- Dependency-layer cache ----------------------------------------
 
-        if code != 0:
-            logger.warning("Dependency install exited with code %d", code)
+    def _resolve_dep_cache(
+        self, repo_path: str, install_deps: bool
+    ) -> tuple[str | None, str, bool]:
+        """Return ``(digest, image, install_deps)`` for this run.
 
-        return combined
+        On a cache hit the committed image is used and only the project
+        install still runs (``install_deps`` is False if there is none);
+        otherwise the base image is used unchanged.
+        """
+        if not install_deps or DEP_CACHE_MAX_IMAGES <= 0:
+            return None, self.image, install_deps
+        digest = _dep_digest(repo_path, self.image)
+        if digest is None:
+            return None, self.image, install_deps
+        cached = f"{DEP_CACHE_REPO}:{digest}"
+        try:
+            self.client.images.get(cached)
+        except ImageNotFound:
+            return digest, self.image, True
+        logger.info("Dependency cache hit: %s", cached)
+        names = _list_repo_files(repo_path) or []
+        return digest, cached, _split_install_script(names)[1] is not None
+
+    def _store_dep_cache(self, container: Container, digest: str) -> None:
+        """Commit the post-install container as ``sandbox-cache:<digest>``.
+
+        The bind-mounted /workspace is not part of the commit, so only the
+        installed packages end up in the image.  Never raises.
+        """
+        try:
+            container.commit(
+                repository=DEP_CACHE_REPO,
+                tag=digest,
+                conf={"Labels": {"managed-by": DEP_CACHE_LABEL}},
+            )
+            logger.info("Cached dependency layer %s:%s", DEP_CACHE_REPO, digest[:12])
+        except Exception as exc:
+            logger.warning("Could not cache dependency layer: %s", exc)
+            return
+        _evict_dep_cache(self.client)
 
     # -- Network isolation after install -------------------------------
 
@@ -281,7 +923,7 @@ class SandboxExecutor:
     def _disconnect_network(container: Container) -> None:
         """Best-effort disconnect from all networks for test isolation."""
         try:
-            client = docker.from_env()
+            client = container.client
             for net_name in list(container.attrs.get("NetworkSettings", {}).get("Networks", {}).keys()):
                 net = client.networks.get(net_name)
                 net.disconnect(container)
@@ -289,27 +931,22 @@ class SandboxExecutor:
         except Exception as exc:
             logger.debug("Could not disconnect network: %s", exc)
 
-    # -- Logs ----------------------------------------------------------
-
-    @staticmethod
-    def _fetch_logs(container: Container) -> str:
-        """Return combined container logs."""
-        try:
-            return container.logs(stdout=True, stderr=True).decode(
-                "utf-8", errors="replace"
-            )
-        except Exception:
-            return ""
-
     # -- Image ---------------------------------------------------------
 
     def _ensure_image(self) -> None:
-        """Pull the sandbox image if it isn't available locally."""
+        """Pull the sandbox image if it isn't available locally.
+
+        Only the first successful check per image and process hits the
+        daemon; later calls return from ``_ready_images``.
+        """
+        if self.image in _ready_images:
+            return
         try:
             self.client.images.get(self.image)
         except ImageNotFound:
             logger.info("Pulling image %s …", self.image)
             self.client.images.pull(self.image)
+        _ready_images.add(self.image)
 
     # -- Cleanup -------------------------------------------------------
 
@@ -3,7 +3,9 @@
 
 Steps
 -----
-1. Run the agent pipeline 3 times on the same repository.
+1. Run the agent pipeline 3 times on the same repository, one after
+   another (or, with ``--concurrent``, in parallel on separate copies of
+   the checkout — only safe when the runs don't share a remote branch).
 2. Strip non-deterministic fields (timestamps, runtime) from each results.json.
 3. Compare all runs — they must produce byte-identical canonical JSON.
 4. Run ``validate_output.py`` on each output.
@@ -24,16 +26,25 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import copy
+import dataclasses
+import difflib
+import hashlib
 import json
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
 # Ensure project root is importable
 _ROOT = Path(__file__).resolve().parent
 if str(_ROOT) not in sys.path:
@@ -41,6 +52,7 @@ if str(_ROOT) not in sys.path:
 
 RUNS = 3
 RESULTS_FILENAME = "results.json"
+DIFF_MAX_LINES = 40  # unified-diff lines shown on mismatch
 
 # ── Timestamp / runtime fields to strip before comparison ────────────
 
@@ -49,7 +61,11 @@ _IGNORE_CI = {"timestamp"}
 
 
 def _strip_nondeterministic(obj: dict[str, Any]) -> dict[str, Any]:
-    """Return a deep copy of *obj* with volatile fields removed."""
+    """Return a shallow view of *obj* with volatile fields removed.
+
+    Nested values are shared with *obj*, not copied; only the top-level
+    dict and the ``ci_timeline`` entries are rebuilt.
+    """
     out = {k: v for k, v in obj.items() if k not in _IGNORE_TOP}
 
     # Strip timestamps inside ci_timeline entries
@@ -59,23 +75,30 @@ def _strip_nondeterministic(obj: dict[str, Any]) -> dict[str, Any]:
             for entry in out["ci_timeline"]
         ]
 
-    # Strip runtime from nested score (it's derived from runtime_seconds)
-    if "score" in out and isinstance(out["score"], dict):
-        out["score"] = dict(out["score"])  # shallow copy
-
     return out
 
 
-def _canonical_json(obj: dict[str, Any]) -> str:
-    """Serialise to deterministic JSON (sorted keys, no trailing whitespace)."""
-    return json.dumps(obj, indent=2, sort_keys=True, ensure_ascii=False)
+def _json_default(value: Any) -> Any:
+    """stdlib ``json`` hook for the dataclass entries in a results dict."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _canonical_json(obj: dict[str, Any]) -> bytes:
+    """Serialise to deterministic UTF-8 JSON (sorted keys, 2-space indent)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2)
+    return json.dumps(
+        obj, indent=2, sort_keys=True, ensure_ascii=False, default=_json_default,
+    ).encode()
 
 
 # ── Mock pipeline for --mock mode ────────────────────────────────────
 
-def _build_mock_result(run_idx: int) -> dict[str, Any]:
+def _build_mock_result(run_idx: int, output_path: Path) -> dict[str, Any]:
     """Simulate a deterministic results.json without any real agent run."""
-    from shared.results_exporter import build_results
+    from shared.results_exporter import export_results
     from agents.run_memory import RunMemory
 
     memory = RunMemory()
@@ -92,13 +115,14 @@ def _build_mock_result(run_idx: int) -> dict[str, Any]:
     # Fake a CI run
     memory.append_ci_run(1, "success")
 
-    return build_results(
+    return export_results(
         memory=memory,
         repo_url="https://github.com/test-org/test-repo",
         branch="ALPHA_ALICE_AI_Fix",
         team_name="ALPHA",
         leader_name="ALICE",
         runtime_seconds=42.0,
+        output_path=output_path,
     )
 
 
@@ -159,6 +183,49 @@ async def _run_pipeline_once(
     return {}
 
 
+async def _run_all_pipelines(
+    args: argparse.Namespace,
+    n_runs: int,
+    tmpdir: Path,
+) -> list[tuple[Path, dict[str, Any] | BaseException]]:
+    """Run the pipeline *n_runs* times, sequentially unless ``--concurrent``.
+
+    Each run works on its own copy of ``--repo-path`` so concurrent runs
+    never touch the same working tree.  They still push to the same branch
+    and poll its CI, hence the opt-in.
+    """
+    async def _one(i: int) -> dict[str, Any]:
+        run_repo = tmpdir / f"repo_run{i}"
+        await asyncio.to_thread(
+            shutil.copytree, args.repo_path, run_repo, symlinks=True,
+        )
+        return await _run_pipeline_once(
+            repo_path=str(run_repo),
+            repo_url=args.repo_url,
+            team_name=args.team,
+            leader_name=args.leader,
+            output_path=tmpdir / f"results_run{i}.json",
+            max_iterations=args.max_iterations,
+        )
+
+    runs = range(1, n_runs + 1)
+    if args.concurrent:
+        outcomes: list[dict[str, Any] | BaseException] = await asyncio.gather(
+            *(_one(i) for i in runs), return_exceptions=True,
+        )
+    else:
+        outcomes = []
+        for i in runs:
+            try:
+                outcomes.append(await _one(i))
+            except Exception as exc:
+                outcomes.append(exc)
+    return [
+        (tmpdir / f"results_run{i}.json", outcome)
+        for i, outcome in zip(runs, outcomes)
+    ]
+
+
 # ── Validation via validate_output.py ────────────────────────────────
 
 def _run_validator(path: Path) -> tuple[bool, str]:
@@ -186,6 +253,11 @@ def main() -> int:
         "--mock", action="store_true",
         help="Use mock data instead of running the real pipeline",
     )
+    parser.add_argument(
+        "--concurrent", action="store_true",
+        help="Run real pipelines in parallel (only when they don't push to "
+             "the same remote branch / CI)",
+    )
     parser.add_argument(
         "--runs", type=int, default=RUNS,
         help=f"Number of runs to compare (default {RUNS})",
@@ -201,34 +273,33 @@ def main() -> int:
     print(f"=== Determinism Self-Test ({n_runs} runs) ===\n")
 
     # ── Step 1: Run agent N times ────────────────────────────────────
-    for i in range(1, n_runs + 1):
-        out_path = tmpdir / f"results_run{i}.json"
-        print(f"Run {i}/{n_runs} ...", end=" ", flush=True)
-
-        try:
-            if args.mock:
-                data = _build_mock_result(i)
-                out_path.write_text(json.dumps(data, indent=2) + "\n")
-            else:
-                if not args.repo_path:
-                    errors.append("--repo-path is required for real runs")
-                    break
-                data = asyncio.run(_run_pipeline_once(
-                    repo_path=args.repo_path,
-                    repo_url=args.repo_url,
-                    team_name=args.team,
-                    leader_name=args.leader,
-                    output_path=out_path,
-                    max_iterations=args.max_iterations,
-                ))
-        except Exception as exc:
-            errors.append(f"Run {i} failed: {exc}")
-            print("ERROR")
-            continue
-
-        results.append(data)
-        result_paths.append(out_path)
-        print("OK")
+    if args.mock:
+        for i in range(1, n_runs + 1):
+            out_path = tmpdir / f"results_run{i}.json"
+            print(f"Run {i}/{n_runs} ...", end=" ", flush=True)
+            try:
+                data = _build_mock_result(i, out_path)
+            except Exception as exc:
+                errors.append(f"Run {i} failed: {exc}")
+                print("ERROR")
+                continue
+            results.append(data)
+            result_paths.append(out_path)
+            print("OK")
+    elif not args.repo_path:
+        errors.append("--repo-path is required for real runs")
+    else:
+        mode = "concurrently" if args.concurrent else "sequentially"
+        print(f"Running {n_runs} pipelines {mode} ...")
+        outcomes = asyncio.run(_run_all_pipelines(args, n_runs, tmpdir))
+        for i, (out_path, outcome) in enumerate(outcomes, 1):
+            if isinstance(outcome, BaseException):
+                errors.append(f"Run {i} failed: {outcome}")
+                print(f"Run {i}/{n_runs} ... ERROR")
+                continue
+            results.append(outcome)
+            result_paths.append(out_path)
+            print(f"Run {i}/{n_runs} ... OK")
 
     if errors:
         print(f"\n--- Errors ---")
@@ -245,28 +316,35 @@ def main() -> int:
     # ── Step 2: Compare outputs ignoring timestamps ──────────────────
     print(f"\nComparing {n_runs} outputs (ignoring timestamps/runtime) ...")
 
-    stripped = [_strip_nondeterministic(r) for r in results]
-    canonical = [_canonical_json(s) for s in stripped]
-
-    identical = all(c == canonical[0] for c in canonical[1:])
+    # Only run 1's canonical string is kept; later runs are hashed and
+    # dropped unless they are the first mismatch (needed for the diff).
+    first = _canonical_json(_strip_nondeterministic(results[0]))
+    first_hash = hashlib.sha256(first).digest()
+    mismatch: tuple[int, bytes] | None = None
+    for i, result in enumerate(results[1:], 2):
+        current = _canonical_json(_strip_nondeterministic(result))
+        if hashlib.sha256(current).digest() != first_hash:
+            mismatch = (i, current)
+            break
+
+    identical = mismatch is None
     if identical:
         print("  All outputs are identical.")
     else:
         print("  MISMATCH detected between runs!\n")
         # Show first diff
-        for i in range(1, len(canonical)):
-            if canonical[i] != canonical[0]:
-                print(f"  --- Run 1 vs Run {i + 1} ---")
-                _print_diff(canonical[0], canonical[i])
-                break
+        run_no, current = mismatch
+        print(f"  --- Run 1 vs Run {run_no} ---")
+        _print_diff(first, current, f"run{run_no}")
         print("\nFAIL")
         return 1
 
     # ── Step 3: Validate each output ─────────────────────────────────
     print(f"\nValidating {n_runs} outputs via validate_output.py ...")
     all_valid = True
-    for i, path in enumerate(result_paths, 1):
-        passed, output = _run_validator(path)
+    with ThreadPoolExecutor(max_workers=len(result_paths)) as pool:
+        verdicts = list(pool.map(_run_validator, result_paths))
+    for i, (passed, output) in enumerate(verdicts, 1):
         status = "PASS" if passed else "FAIL"
         print(f"  Run {i}: {status}  {output}")
         if not passed:
@@ -287,23 +365,18 @@ def main() -> int:
         return 1
 
 
-def _print_diff(a: str, b: str) -> None:
-    """Print a simple line-by-line diff between two JSON strings."""
-    a_lines = a.splitlines()
-    b_lines = b.splitlines()
-    max_lines = max(len(a_lines), len(b_lines))
+def _print_diff(a: bytes, b: bytes, b_label: str = "run2") -> None:
+    """Print a unified diff between two JSON strings, capped at DIFF_MAX_LINES."""
+    diff = difflib.unified_diff(
+        a.decode().splitlines(), b.decode().splitlines(),
+        fromfile="run1", tofile=b_label, lineterm="", n=1,
+    )
     shown = 0
-    for idx in range(max_lines):
-        la = a_lines[idx] if idx < len(a_lines) else "<missing>"
-        lb = b_lines[idx] if idx < len(b_lines) else "<missing>"
-        if la != lb:
-            print(f"    L{idx + 1}:")
-            print(f"      run1: {la}")
-            print(f"      run2: {lb}")
-            shown += 1
-            if shown >= 10:
-                print("    ... (truncated)")
-                break
+    for line in islice(diff, DIFF_MAX_LINES):
+        print(f"    {line}")
+        shown += 1
+    if shown == DIFF_MAX_LINES and next(diff, None) is not None:
+        print("    ... (truncated)")
 
 
 if __name__ == "__main__":
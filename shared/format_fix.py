@@ -57,15 +57,7 @@ def format_fix_record(
     """
     bug_type = "unknown"
     if memory is not None:
-        for f in memory.failures:
-            if f.file == fix.file and f.line == fix.line:
-                bug_type = f.bug_type
-                break
-        else:
-            for f in memory.failures:
-                if f.file == fix.file:
-                    bug_type = f.bug_type
-                    break
+        bug_type = memory.bug_type_for(fix.file, fix.line)
 
     return format_fix(
         bug_type=bug_type,
@@ -75,6 +67,11 @@ def format_fix_record(
     )
 
 
+def format_all_records(memory: RunMemory) -> list[str]:
+    """Format every ``FixRecord`` in *memory*, resolving bug types from it."""
+    return [format_fix_record(fix, memory) for fix in memory.fixes]
+
+
 def format_fix_dict(fix: dict[str, Any]) -> str:
     """Format a plain fix dict from ``results.json``.
 
@@ -16,20 +16,41 @@ Usage::
         runtime_seconds=247.3,
         output_path="shared/results.json",
     )
+
+The module is fully annotated and compiles unchanged with mypyc for
+native-speed matching/building loops (optional; the built ``.so`` is
+imported in preference to this file)::
+
+    mypyc --explicit-package-bases --ignore-missing-imports shared/results_exporter.py
 """
 
 from __future__ import annotations
 
+import dataclasses
 import json
-from datetime import datetime, timezone
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
+
+from agents.run_memory import FailureRecord, FixRecord, RunMemory
+from shared.timestamps import utc_now_iso
 
-from agents.run_memory import RunMemory
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    orjson = None  # type: ignore[assignment]
 
 # Default output location
 _DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results.json"
 
+# Temp clone dirs produced by tempfile.mkdtemp(prefix="heal_"),
+# e.g. /var/folders/.../heal_abcdef/ or /tmp/heal_abcdef/
+_HEAL_RE = re.compile(r"/heal_[^/]+/(.*)")
+# Project-root markers used to relativise other absolute paths
+_ROOT_MARKERS = ("src/", "lib/", "app/", "tests/", "test/")
+
 
 # ── Public API ───────────────────────────────────────────────────────
 
@@ -67,10 +88,80 @@ def export_results(
 
     dest = Path(output_path) if output_path else _DEFAULT_OUTPUT
     dest.parent.mkdir(parents=True, exist_ok=True)
-    dest.write_text(json.dumps(results, indent=2) + "\n")
+    with dest.open("wb") as fh:
+        _write_results(fh, results)
     return results
 
 
+@dataclass(slots=True)
+class FailureDetection:
+    """One entry of the results.json ``failures_detected`` array.
+
+    Kept as a dataclass in the results dict: orjson serialises it
+    natively (fields in declaration order), so no per-entry dict is built.
+    """
+
+    file: str
+    line: int
+    bug_type: str
+    message: str
+    description: str
+    iteration: int
+
+
+# Top-level arrays that are written one element at a time
+_STREAMED_ARRAYS = frozenset({"failures_detected", "fixes", "ci_timeline"})
+
+
+def _json_default(value: Any) -> Any:
+    """stdlib ``json`` hook: dataclass entries → dicts in field order."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value: Any) -> bytes:
+    """2-space-indented UTF-8 JSON; non-ASCII (e.g. "→") written verbatim."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+    return json.dumps(
+        value, indent=2, ensure_ascii=False, default=_json_default,
+    ).encode("utf-8")
+
+
+def _indented(value: Any, depth: int) -> bytes:
+    """``_dumps(value)`` re-indented to start at nesting level *depth*.
+
+    JSON strings can't contain raw newlines, so every b"\\n" is a line break.
+    """
+    return _dumps(value).replace(b"\n", b"\n" + b"  " * depth)
+
+
+def _write_results(fh: BinaryIO, results: dict[str, Any]) -> None:
+    """Write *results* to *fh* as indented JSON with a trailing newline.
+
+    The big arrays are encoded element by element, so no single buffer
+    holds the whole document.  Key order is the schema order from
+    ``build_results`` and the bytes equal ``_dumps(results) + b"\\n"``.
+    """
+    if not results:
+        fh.write(b"{}\n")
+        return
+    fh.write(b"{")
+    for i, (key, value) in enumerate(results.items()):
+        fh.write(b",\n  " if i else b"\n  ")
+        fh.write(_dumps(key) + b": ")
+        if key in _STREAMED_ARRAYS and isinstance(value, list) and value:
+            fh.write(b"[")
+            for j, item in enumerate(value):
+                fh.write(b",\n    " if j else b"\n    ")
+                fh.write(_indented(item, 2))
+            fh.write(b"\n  ]")
+        else:
+            fh.write(_indented(value, 1))
+    fh.write(b"\n}\n")
+
+
 def build_results(
     memory: RunMemory,
     repo_url: str,
@@ -82,13 +173,19 @@ def build_results(
     """Build the canonical results dictionary without writing to disk.
 
     Useful for testing or when the caller handles persistence.
+    ``failures_detected`` holds :class:`FailureDetection` instances;
+    orjson and FastAPI encode them as plain JSON objects.
     """
     fixes = _build_fixes(memory)
     failures_detected = _build_failures_detected(memory)
-    ci_timeline = _build_ci_timeline(memory)
     total_commits = _count_unique_commits(memory)
     final_ci = _resolve_final_ci_status(memory)
 
+    # Competition score: base 100, +10 if runtime < 300 s,
+    # -2 per commit after 20, floored at 0.
+    speed_bonus = 10 if runtime_seconds < 300 else 0
+    commit_penalty = -2 * max(total_commits - 20, 0)
+
     return {
         "repository_url": repo_url,
         "branch": branch,
@@ -100,46 +197,53 @@ def build_results(
         "runtime_seconds": round(runtime_seconds, 2),
         "failures_detected": failures_detected,
         "fixes": fixes,
-        "ci_timeline": ci_timeline,
-        "score": _calculate_score(
-            final_ci=final_ci,
-            runtime_seconds=runtime_seconds,
-            total_commits=total_commits,
-        ),
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "ci_timeline": [
+            {
+                "iteration": ci.iteration,
+                "status": "PASSED" if ci.status == "success" else "FAILED",
+                "timestamp": ci.start_time,
+            }
+            for ci in memory.ci_runs
+        ],
+        "score": {
+            "base": 100,
+            "speed_bonus": speed_bonus,
+            "commit_penalty": commit_penalty,
+            "total_commits": total_commits,
+            "final_score": max(100 + speed_bonus + commit_penalty, 0),
+        },
+        "generated_at": utc_now_iso(),
     }
 
 
 # ── Internal helpers ─────────────────────────────────────────────────
 
-def _build_failures_detected(memory: RunMemory) -> list[dict[str, Any]]:
+def _build_failures_detected(memory: RunMemory) -> list[FailureDetection]:
     """Build the failures array from RunMemory failure records.
 
     Each detection entry includes a 'description' in the canonical test-case
     format: '{file} — Line {line}: {message}'
+
+    ``memory.failures`` is already sorted by (file, line), so one dedup
+    pass yields the output in its final order.
     """
-    seen: set[tuple[str, int, str]] = set()
-    failures: list[dict[str, Any]] = []
+    # First record per (file, line, bug_type); dicts keep insertion order.
+    # Keyed on the tuple itself, not hash(tuple): a hash collision would
+    # silently drop a distinct failure from the report.
+    unique: dict[tuple[str, int, str], FailureRecord] = {}
     for failure in memory.failures:
-        key = (failure.file, failure.line, failure.bug_type)
-        if key in seen:
-            continue
-        seen.add(key)
-
-        # Build canonical detection description
-        # Format: "src/utils.py — Line 15: Unused import 'os'"
-        description = f"{failure.file} — Line {failure.line}: {failure.standardized_message}"
-
-        failures.append({
-            "file": failure.file,
-            "line": failure.line,
-            "bug_type": failure.bug_type,
-            "message": failure.standardized_message,
-            "description": description,
-            "iteration": failure.iteration,
-        })
-    failures.sort(key=lambda f: (f["file"], f["line"]))
-    return failures
+        unique.setdefault((failure.file, failure.line, failure.bug_type), failure)
+    return [
+        FailureDetection(
+            failure.file,
+            failure.line,
+            failure.bug_type,
+            failure.standardized_message,
+            failure.description,
+            failure.iteration,
+        )
+        for failure in unique.values()
+    ]
 
 
 def _build_fixes(memory: RunMemory) -> list[dict[str, Any]]:
@@ -149,40 +253,48 @@ def _build_fixes(memory: RunMemory) -> list[dict[str, Any]]:
     Each fix includes a 'description' in the canonical test-case
     format: '{BUG_TYPE} error in {file} line {line} → Fix: {message}'
     """
-    fixes: list[dict[str, Any]] = []
+    failure_index = _build_failure_index(memory)
+    # A fix is "verified" if some CI run at or after its iteration passed,
+    # i.e. iff the latest passing iteration is >= the fix's iteration.
+    last_success = memory.latest_success_iteration
+    # Bucket by (file, line) and emit buckets in key order: one sort over
+    # the distinct keys, with same-key fixes kept in their original order.
+    fix_entry = _fix_entry
+    buckets: dict[tuple[str, int], list[dict[str, Any]]] = {}
     for fix in memory.fixes:
-        # Determine status: if the fix's iteration has a later CI run
-        # that passed, mark as "verified"; otherwise "applied".
-        status = "applied"
-        for ci in memory.ci_runs:
-            if ci.iteration >= fix.iteration and ci.status == "success":
-                status = "verified"
-                break
-
-        # Normalize file path: strip temp clone dir to get relative path
-        rel_file = _strip_temp_prefix(fix.file)
-
-        bug_type = _infer_bug_type(fix, memory)
-        failure_msg = _infer_failure_message(fix, memory)
-        commit_msg = fix.change_summary
-
-        # Build the canonical description line required by the competition
-        # Format: "{BUG_TYPE} error in {file} line {line} → Fix: {message}"
-        description = f"{bug_type} error in {rel_file} line {fix.line} → Fix: {commit_msg}"
-
-        fixes.append({
-            "file": rel_file,
-            "bug_type": bug_type,
-            "line": fix.line,
-            "commit_message": commit_msg,
-            "status": status,
-            "description": description,
-            "failure_message": failure_msg,
-        })
-    fixes.sort(key=lambda f: (f["file"], f["line"]))
-    return fixes
+        entry = fix_entry(fix, failure_index, last_success)
+        buckets.setdefault((entry["file"], entry["line"]), []).append(entry)
+    return [entry for key in sorted(buckets) for entry in buckets[key]]
+
+
+def _fix_entry(
+    fix: FixRecord,
+    failure_index: _FailureIndex,
+    last_success: int | None,
+) -> dict[str, Any]:
+    """Build one entry of the results.json ``fixes`` array."""
+    verified = last_success is not None and fix.iteration <= last_success
 
+    # Normalize file path: strip temp clone dir to get relative path
+    rel_file = _strip_temp_prefix(fix.file)
 
+    failure = _match_failure(fix, failure_index)
+    bug_type = _infer_bug_type(fix, failure)
+    commit_msg = fix.change_summary
+
+    return {
+        "file": rel_file,
+        "bug_type": bug_type,
+        "line": fix.line,
+        "commit_message": commit_msg,
+        "status": "verified" if verified else "applied",
+        # Canonical description line required by the competition
+        "description": f"{bug_type} error in {rel_file} line {fix.line} → Fix: {commit_msg}",
+        "failure_message": _infer_failure_message(fix, failure),
+    }
+
+
+@lru_cache(maxsize=4096)
 def _strip_temp_prefix(filepath: str) -> str:
     """Strip temp clone directory prefix from absolute paths.
 
@@ -190,24 +302,29 @@ def _strip_temp_prefix(filepath: str) -> str:
     Converts '/tmp/heal_xxx/src/app.py' → 'src/app.py'
     Leaves relative paths like 'src/app.py' unchanged.
     """
-    import re as _re
-    # Match common temp dir patterns produced by tempfile.mkdtemp(prefix="heal_")
-    # e.g. /var/folders/.../heal_abcdef/ or /tmp/heal_abcdef/
-    m = _re.search(r'/heal_[^/]+/(.*)', filepath)
+    m = _HEAL_RE.search(filepath)
     if m:
         return m.group(1)
     # Generic: if it looks like an absolute path, try to find src/ or a
     # common project root marker
     if filepath.startswith("/"):
-        for marker in ("src/", "lib/", "app/", "tests/", "test/"):
+        for marker in _ROOT_MARKERS:
             idx = filepath.find(marker)
             if idx != -1:
                 return filepath[idx:]
     return filepath
 
 
+def _basename(filepath: str) -> str:
+    """Final component of a POSIX path, without building a PurePath."""
+    return filepath.rpartition("/")[2]
+
+
 def _normalize_for_match(filepath: str) -> str:
-    """Normalize a file path for comparison (strip temp prefix, get basename-relative)."""
+    """Normalize a file path for comparison (strip temp prefix, get basename-relative).
+
+    Memoised through ``_strip_temp_prefix``.
+    """
     return _strip_temp_prefix(filepath)
 
 
@@ -262,90 +379,86 @@ def _infer_bug_type_from_text(text: str) -> str:
     return "unknown"
 
 
-def _infer_bug_type(fix, memory: RunMemory) -> str:
-    """Match a fix back to its failure record to extract bug_type.
+# (norm_file, line), norm_file, (basename, line), basename → first failure
+_FailureIndex = tuple[
+    dict[tuple[str, int], FailureRecord],
+    dict[str, FailureRecord],
+    dict[tuple[str, int], FailureRecord],
+    dict[str, FailureRecord],
+]
 
-    Priority:
-      1. Direct bug_type stored on FixRecord (from classified bug)
-      2. Exact file + line match against failure records
-      3. Same file match against failure records
-      4. Basename match against failure records
-      5. Text-based inference from the change_summary
+
+def _build_failure_index(memory: RunMemory) -> _FailureIndex:
+    """Index failures for O(1) fix matching.
+
+    ``memory.failures`` is sorted by (file, line), so ``setdefault`` keeps
+    the same first match the former linear scans returned.  Failures with
+    an ``'unknown'`` file never match.
     """
-    # Priority 1: use bug_type stored directly on the fix record
-    if getattr(fix, 'bug_type', '') and fix.bug_type not in ('', 'unknown'):
-        return fix.bug_type
+    by_fl: dict[tuple[str, int], FailureRecord] = {}
+    by_f: dict[str, FailureRecord] = {}
+    by_bl: dict[tuple[str, int], FailureRecord] = {}
+    by_b: dict[str, FailureRecord] = {}
+    for failure in memory.failures:
+        if failure.file == "unknown":
+            continue
+        norm = _normalize_for_match(failure.file)
+        base = _basename(failure.file)
+        by_fl.setdefault((norm, failure.line), failure)
+        by_f.setdefault(norm, failure)
+        by_bl.setdefault((base, failure.line), failure)
+        by_b.setdefault(base, failure)
+    return by_fl, by_f, by_bl, by_b
+
 
+def _match_failure(fix: FixRecord, index: _FailureIndex) -> FailureRecord | None:
+    """Match a fix back to its failure record.
+
+    Priority:
+      1. Exact file + line match (after temp-prefix normalisation)
+      2. Same file, any line
+      3. Basename + line match
+      4. Basename, any line
+    """
+    by_fl, by_f, by_bl, by_b = index
     fix_file = _normalize_for_match(fix.file)
-    # Priority 2: Exact match on normalized file + line
-    for failure in memory.failures:
-        if failure.file != 'unknown' and _normalize_for_match(failure.file) == fix_file and failure.line == fix.line:
-            return failure.bug_type
-    # Priority 3: same file, any line
-    for failure in memory.failures:
-        if failure.file != 'unknown' and _normalize_for_match(failure.file) == fix_file:
-            return failure.bug_type
-    # Priority 4: basename match
-    from pathlib import Path as _Path
-    fix_basename = _Path(fix_file).name
-    for failure in memory.failures:
-        if failure.file != 'unknown' and _Path(failure.file).name == fix_basename and failure.line == fix.line:
-            return failure.bug_type
-    for failure in memory.failures:
-        if failure.file != 'unknown' and _Path(failure.file).name == fix_basename:
-            return failure.bug_type
+    fix_basename = _basename(fix_file)
+    return (
+        by_fl.get((fix_file, fix.line))
+        or by_f.get(fix_file)
+        or by_bl.get((fix_basename, fix.line))
+        or by_b.get(fix_basename)
+    )
 
-    # Priority 5: infer from change_summary text
+
+def _infer_bug_type(fix: FixRecord, failure: FailureRecord | None) -> str:
+    """Resolve a fix's bug_type.
+
+    Priority:
+      1. Direct bug_type stored on FixRecord (from classified bug)
+      2. The matched failure record (see ``_match_failure``)
+      3. Text-based inference from the change_summary
+    """
+    if fix.bug_type and fix.bug_type != "unknown":
+        return fix.bug_type
+    if failure is not None:
+        return failure.bug_type
     return _infer_bug_type_from_text(fix.change_summary)
 
 
-def _infer_failure_message(fix, memory: RunMemory) -> str:
-    """Match a fix back to its failure record to extract the original message.
+def _infer_failure_message(fix: FixRecord, failure: FailureRecord | None) -> str:
+    """Resolve the original failure message behind a fix.
 
     Priority:
       1. Direct failure_message stored on FixRecord
-      2. Exact file + line match against failure records
-      3. Same file match against failure records
-      4. Basename match against failure records
-      5. Fall back to the change_summary as the message
+      2. The matched failure record (see ``_match_failure``)
+      3. Fall back to the change_summary as the message
     """
-    # Priority 1: use failure_message stored directly on the fix record
-    if getattr(fix, 'failure_message', '') and fix.failure_message:
+    if fix.failure_message:
         return fix.failure_message
-
-    fix_file = _normalize_for_match(fix.file)
-    for failure in memory.failures:
-        if failure.file != 'unknown' and _normalize_for_match(failure.file) == fix_file and failure.line == fix.line:
-            return failure.standardized_message
-    for failure in memory.failures:
-        if failure.file != 'unknown' and _normalize_for_match(failure.file) == fix_file:
-            return failure.standardized_message
-    # Fallback: basename match
-    from pathlib import Path as _Path
-    fix_basename = _Path(fix_file).name
-    for failure in memory.failures:
-        if failure.file != 'unknown' and _Path(failure.file).name == fix_basename and failure.line == fix.line:
-            return failure.standardized_message
-    for failure in memory.failures:
-        if failure.file != 'unknown' and _Path(failure.file).name == fix_basename:
-            return failure.standardized_message
-
-    # Priority 5: fall back to change_summary
-    if fix.change_summary:
-        return fix.change_summary
-    return ""
-
-
-def _build_ci_timeline(memory: RunMemory) -> list[dict[str, Any]]:
-    """Build the CI timeline array from RunMemory CI run records."""
-    return [
-        {
-            "iteration": ci.iteration,
-            "status": "PASSED" if ci.status == "success" else "FAILED",
-            "timestamp": ci.start_time,
-        }
-        for ci in memory.ci_runs
-    ]
+    if failure is not None:
+        return failure.standardized_message
+    return fix.change_summary or ""
 
 
 def _resolve_final_ci_status(memory: RunMemory) -> str:
@@ -364,35 +477,4 @@ def _resolve_final_ci_status(memory: RunMemory) -> str:
 
 def _count_unique_commits(memory: RunMemory) -> int:
     """Count the number of distinct commit SHAs across all fixes."""
-    return len({fix.commit_hash for fix in memory.fixes if fix.commit_hash})
-
-
-def _calculate_score(
-    final_ci: str,
-    runtime_seconds: float,
-    total_commits: int,
-) -> dict[str, Any]:
-    """Calculate the competition score.
-
-    Rules:
-      • base:  100 points
-      • +10   if runtime < 300 seconds
-      • −2    per commit after 20
-      • final_score = max(base + bonuses + penalties, 0)
-    """
-    base = 100
-
-    speed_bonus = 10 if runtime_seconds < 300 else 0
-
-    excess_commits = max(total_commits - 20, 0)
-    commit_penalty = -2 * excess_commits
-
-    final_score = max(base + speed_bonus + commit_penalty, 0)
-
-    return {
-        "base": base,
-        "speed_bonus": speed_bonus,
-        "commit_penalty": commit_penalty,
-        "total_commits": total_commits,
-        "final_score": final_score,
-    }
+    return memory.unique_commit_count
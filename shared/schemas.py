@@ -1,10 +1,26 @@
-"""Shared schemas used across agents and backend."""
+"""Shared schemas used across agents and backend.
 
+Schemas are slotted dataclasses: no per-instance ``__dict__`` for objects
+created in bulk.
+"""
+
+import dataclasses
+import json
 from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass
+def to_json(obj: Any) -> bytes:
+    """Serialise a schema instance (or a list of them) to JSON bytes."""
+    def _default(o: Any) -> Any:
+        if dataclasses.is_dataclass(o):
+            return dataclasses.asdict(o)
+        raise TypeError(f"{type(o).__name__} is not JSON serializable")
+
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+@dataclass(slots=True)
 class PipelineRun:
     job_id: str
     repo_url: str
@@ -13,7 +29,7 @@ class PipelineRun:
     agent_results: list[dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class BugReport:
     test_name: str
     category: str
@@ -24,7 +40,7 @@ class BugReport:
     line_number: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FixProposal:
     bug: BugReport
     suggestion: str
@@ -33,7 +49,7 @@ class FixProposal:
     status: str = "pending"  # pending | applied | rejected
 
 
-@dataclass
+@dataclass(slots=True)
 class HealIteration:
     """Snapshot of one heal-loop iteration."""
     iteration: int
@@ -44,7 +60,7 @@ class HealIteration:
     timestamp: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class HealLoopResult:
     """Aggregated result of the entire heal loop."""
     status: str  # healed | partial | failed
@@ -0,0 +1,34 @@
+"""Cheap UTC ISO-8601 timestamps.
+
+``datetime.now(timezone.utc).isoformat()`` builds a full ``datetime``
+per call.  Records created in bulk (tool results, CI runs, iterations)
+only need the string, so :func:`utc_now_iso` formats the date/time
+prefix once per wall-clock second and appends the sub-second part with
+plain string formatting.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8)
+def _second_prefix(epoch_s: int) -> str:
+    return datetime.fromtimestamp(epoch_s, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def iso_from_ns(ns: int) -> str:
+    """Format an epoch-nanosecond timestamp like :func:`utc_now_iso`."""
+    seconds, rem = divmod(ns, 1_000_000_000)
+    return f"{_second_prefix(seconds)}.{rem // 1000:06d}+00:00"
+
+
+def utc_now_iso() -> str:
+    """Return the current UTC time as ``YYYY-MM-DDTHH:MM:SS.ffffff+00:00``.
+
+    Same shape as ``datetime.isoformat()`` on an aware UTC datetime,
+    except the microseconds are always present.
+    """
+    return iso_from_ns(time.time_ns())
@@ -2,8 +2,9 @@
 """Torture test — exercises the agent against five distinct repo scenarios.
 
 All scenarios are fully mocked (no Docker, no GitHub API calls) and run
-entirely in-process.  Each scenario sets up a temporary repo with specific
-characteristics and verifies the agent's behaviour via assertions.
+entirely in-process, concurrently on a single event loop.  Each scenario
+sets up a temporary repo with specific characteristics and verifies the
+agent's behaviour via assertions.
 
 Scenarios
 ---------
@@ -26,16 +27,31 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import atexit
+import contextlib
+import functools
 import io
+import itertools
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 import textwrap
 import zipfile
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from typing import Any, Iterator
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+
+try:
+    import pygit2
+except ImportError:  # optional: fall back to the git CLI
+    pygit2 = None
 
 # Ensure project root is importable
 _ROOT = Path(__file__).resolve().parent
@@ -43,6 +59,7 @@ if str(_ROOT) not in sys.path:
     sys.path.insert(0, str(_ROOT))
 
 from agents.reasoning_loop import run_reasoning_loop, ReasoningLoopResult
+from agents.tools import test_runner_tool
 from sandbox.executor import ExecutionResult
 
 
@@ -50,7 +67,9 @@ from sandbox.executor import ExecutionResult
 #  Helpers
 # ═══════════════════════════════════════════════════════════════════════
 
+@functools.lru_cache(maxsize=None)
 def _mock_exec(success: bool, stdout: str = "", stderr: str = "") -> ExecutionResult:
+    """Shared result per (success, stdout, stderr); the test runner only reads it."""
     return ExecutionResult(
         exit_code=0 if success else 1,
         stdout=stdout,
@@ -61,6 +80,7 @@ def _mock_exec(success: bool, stdout: str = "", stderr: str = "") -> ExecutionRe
     )
 
 
+@functools.lru_cache(maxsize=32)
 def _make_ci_log_zip(content: str) -> bytes:
     buf = io.BytesIO()
     with zipfile.ZipFile(buf, "w") as zf:
@@ -77,56 +97,102 @@ def _base_config(repo_path: str) -> dict[str, Any]:
     }
 
 
+# Environment for the git CLI fallback, built once
+_GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "t@t.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "t@t.com",
+}
+
+
+@functools.cache
+def _template_git_dir() -> Path:
+    """An empty ``.git`` made by one ``git init``, copied into each repo."""
+    root = Path(tempfile.mkdtemp(prefix="torture_template_"))
+    atexit.register(shutil.rmtree, root, ignore_errors=True)
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    return root / ".git"
+
+
 def _init_git(path: Path) -> None:
-    """Init a bare git repo with an initial commit."""
-    env = {
-        **os.environ,
-        "GIT_AUTHOR_NAME": "Test",
-        "GIT_AUTHOR_EMAIL": "t@t.com",
-        "GIT_COMMITTER_NAME": "Test",
-        "GIT_COMMITTER_EMAIL": "t@t.com",
-    }
-    subprocess.run(["git", "init"], cwd=path, capture_output=True, env=env)
-    subprocess.run(["git", "add", "-A"], cwd=path, capture_output=True, env=env)
-    subprocess.run(["git", "commit", "-m", "init"], cwd=path, capture_output=True, env=env)
+    """Init a git repo in *path* and commit everything in it.
+
+    Done in-process through libgit2 when ``pygit2`` is installed, which
+    saves three git process spawns per scenario.  The CLI fallback copies
+    a template ``.git`` instead of running ``git init`` every time.
+    """
+    if pygit2 is not None:
+        repo = pygit2.init_repository(str(path))
+        index = repo.index
+        index.add_all()
+        index.write()
+        author = pygit2.Signature("Test", "t@t.com")
+        repo.create_commit("HEAD", author, author, "init", index.write_tree(), [])
+        return
+
+    shutil.copytree(_template_git_dir(), path / ".git")
+    subprocess.run(
+        "git add -A && git commit -q -m init", shell=True, cwd=path, env=_GIT_ENV, check=True,
+    )
+
+
+def _make_repo(path: Path, files: dict[str, str]) -> Path:
+    """Create *path* holding *files* (name → text), committed to git.
+
+    Each file is one ``os.open``/``os.write``/``os.close``; ``write_text``
+    also pays for the io stack's fstat, isatty and seek calls.
+    """
+    path.mkdir()
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+    for name, text in files.items():
+        fd = os.open(path / name, flags, 0o644)
+        try:
+            os.write(fd, text.encode("utf-8"))
+        finally:
+            os.close(fd)
+    _init_git(path)
+    return path
 
 
 def _mock_git(sha: str = "aaa1111"):
     """Return a side_effect for subprocess.run that fakes git ops."""
     def _run(cmd, cwd, **kw):
-        r = MagicMock()
-        r.returncode = 0
-        r.stderr = ""
         if "rev-parse" in cmd:
-            r.stdout = f"{sha}\n"
+            stdout = f"{sha}\n"
         elif "status" in cmd:
-            r.stdout = "M app.py\n"
+            stdout = "M app.py\n"
         else:
-            r.stdout = ""
-        return r
+            stdout = ""
+        return subprocess.CompletedProcess(cmd, 0, stdout, "")
     return _run
 
 
+def _ci_response(*, content: bytes = b"", runs: list[dict] | None = None) -> SimpleNamespace:
+    """A 200 httpx-style response: log-zip *content* or a ``workflow_runs`` page."""
+    payload = {"workflow_runs": runs or []}
+    return SimpleNamespace(
+        status_code=200,
+        raise_for_status=lambda: None,
+        content=content,
+        json=lambda: payload,
+    )
+
+
 def _mock_ci_client(conclusion: str, log_text: str):
     """Build an AsyncMock httpx client returning the given CI conclusion."""
-    ci_resp = {"workflow_runs": [{
+    runs_resp = _ci_response(runs=[{
         "id": 1,
         "head_sha": "aaa1111",
         "status": "completed",
         "conclusion": conclusion,
         "html_url": "http://ci/1",
-    }]}
-    ci_zip = _make_ci_log_zip(log_text)
+    }])
+    logs_resp = _ci_response(content=_make_ci_log_zip(log_text))
 
     async def _get(url, **kw):
-        resp = MagicMock()
-        resp.status_code = 200
-        resp.raise_for_status = MagicMock()
-        if "logs" in url:
-            resp.content = ci_zip
-        else:
-            resp.json = MagicMock(return_value=ci_resp)
-        return resp
+        return logs_resp if "logs" in url else runs_resp
 
     client = AsyncMock()
     client.get = _get
@@ -135,6 +201,70 @@ def _mock_ci_client(conclusion: str, log_text: str):
     return client
 
 
+# ── Per-scenario mocks ───────────────────────────────────────────────
+#
+# Scenarios run concurrently on one event loop, but patching swaps
+# process-wide globals (``subprocess.run`` and ``httpx.AsyncClient`` are
+# shared modules).  So the patches are installed once for the whole run
+# (``_patched_tools``) and dispatch through a ContextVar; each scenario
+# binds its own mocks with ``_use_mocks``, and asyncio gives every task
+# its own copy of the context.
+
+_scenario_mocks: ContextVar[dict[str, Any]] = ContextVar("scenario_mocks", default={})
+
+_real_subprocess_run = subprocess.run
+_real_async_client = httpx.AsyncClient
+
+
+@contextlib.contextmanager
+def _use_mocks(**mocks: Any) -> Iterator[None]:
+    """Bind *executor*, *git* and/or *ci_client* mocks for this scenario."""
+    token = _scenario_mocks.set(mocks)
+    try:
+        yield
+    finally:
+        _scenario_mocks.reset(token)
+
+
+def _dispatch_executor():
+    return _scenario_mocks.get()["executor"]
+
+
+def _dispatch_subprocess_run(*args, **kw):
+    git = _scenario_mocks.get().get("git")
+    return git(*args, **kw) if git is not None else _real_subprocess_run(*args, **kw)
+
+
+def _dispatch_async_client(*args, **kw):
+    ci_client = _scenario_mocks.get().get("ci_client")
+    return ci_client if ci_client is not None else _real_async_client(*args, **kw)
+
+
+@contextlib.contextmanager
+def _swap(obj: Any, name: str, new: Any) -> Iterator[None]:
+    """Set ``obj.name = new`` for the duration of the block."""
+    old = getattr(obj, name)
+    setattr(obj, name, new)
+    try:
+        yield
+    finally:
+        setattr(obj, name, old)
+
+
+@contextlib.contextmanager
+def _patched_tools() -> Iterator[None]:
+    """Route the agent's executor, git and CI calls to the bound mocks.
+
+    commit_push_tool calls ``subprocess.run`` and the CI tools call
+    ``httpx.AsyncClient`` through the shared modules, so one swap each
+    covers every tool.
+    """
+    with _swap(test_runner_tool, "_get_executor", _dispatch_executor), \
+         _swap(subprocess, "run", _dispatch_subprocess_run), \
+         _swap(httpx, "AsyncClient", _dispatch_async_client):
+        yield
+
+
 # ═══════════════════════════════════════════════════════════════════════
 #  Scenario result
 # ═══════════════════════════════════════════════════════════════════════
@@ -167,13 +297,11 @@ async def scenario_passing_repo(tmp: Path) -> ScenarioResult:
     """All tests pass from the start — agent should exit without commits."""
     sr = ScenarioResult(name="1) Passing repo")
 
-    repo = tmp / "passing"
-    repo.mkdir()
-    (repo / "app.py").write_text("def greet(name):\n    return f'Hello, {name}!'\n")
-    (repo / "test_app.py").write_text(
-        "from app import greet\ndef test_greet():\n    assert greet('X') == 'Hello, X!'\n"
-    )
-    _init_git(repo)
+    repo = _make_repo(tmp / "passing", {
+        "app.py": "def greet(name):\n    return f'Hello, {name}!'\n",
+        "test_app.py":
+            "from app import greet\ndef test_greet():\n    assert greet('X') == 'Hello, X!'\n",
+    })
 
     async def run_pass(repo_path, test_command, install_deps=True):
         return _mock_exec(True, stdout="1 passed in 0.01s\n")
@@ -182,7 +310,7 @@ async def scenario_passing_repo(tmp: Path) -> ScenarioResult:
     mock_exec.run_tests = run_pass
 
     try:
-        with patch("agents.tools.test_runner_tool._get_executor", return_value=mock_exec):
+        with _use_mocks(executor=mock_exec):
             result = await run_reasoning_loop(
                 repo_path=str(repo),
                 max_iterations=5,
@@ -206,29 +334,30 @@ async def scenario_passing_repo(tmp: Path) -> ScenarioResult:
 
 # ── 2. Single syntax error ──────────────────────────────────────────
 
+# Local pytest output for the missing colon in app.py (also scenario 4)
+_GREET_SYNTAX_FAIL_OUT = textwrap.dedent("""\
+    FAILED test_app.py::test_greet
+    File "app.py", line 1
+        def greet(name)
+                       ^
+    SyntaxError: expected ':'
+""")
+
+
 async def scenario_single_syntax_error(tmp: Path) -> ScenarioResult:
     """One missing colon — agent should fix in ≤ 2 iterations with ≤ 2 commits."""
     sr = ScenarioResult(name="2) Single syntax error")
 
-    repo = tmp / "single_bug"
-    repo.mkdir()
-    (repo / "app.py").write_text("def greet(name)\n    return f'Hello, {name}!'\n")
-    (repo / "test_app.py").write_text(
-        "from app import greet\ndef test_greet():\n    assert greet('X') == 'Hello, X!'\n"
-    )
-    _init_git(repo)
-
-    fail_out = textwrap.dedent("""\
-        FAILED test_app.py::test_greet
-        File "app.py", line 1
-            def greet(name)
-                           ^
-        SyntaxError: expected ':'
-    """)
+    repo = _make_repo(tmp / "single_bug", {
+        "app.py": "def greet(name)\n    return f'Hello, {name}!'\n",
+        "test_app.py":
+            "from app import greet\ndef test_greet():\n    assert greet('X') == 'Hello, X!'\n",
+    })
+
     pass_out = "1 passed in 0.01s\n"
 
     async def run_tests(repo_path, test_command, install_deps=True):
-        return _mock_exec(False, stdout=fail_out)
+        return _mock_exec(False, stdout=_GREET_SYNTAX_FAIL_OUT)
 
     mock_exec = MagicMock()
     mock_exec.run_tests = run_tests
@@ -236,11 +365,7 @@ async def scenario_single_syntax_error(tmp: Path) -> ScenarioResult:
     ci_client = _mock_ci_client("success", pass_out)
 
     try:
-        with patch("agents.tools.test_runner_tool._get_executor", return_value=mock_exec), \
-             patch("agents.tools.commit_push_tool.subprocess.run", side_effect=_mock_git()), \
-             patch("agents.tools.wait_for_ci_tool.httpx.AsyncClient", return_value=ci_client), \
-             patch("agents.tools.fetch_ci_results_tool.httpx.AsyncClient", return_value=ci_client):
-
+        with _use_mocks(executor=mock_exec, git=_mock_git(), ci_client=ci_client):
             result = await run_reasoning_loop(
                 repo_path=str(repo),
                 max_iterations=5,
@@ -263,50 +388,53 @@ async def scenario_single_syntax_error(tmp: Path) -> ScenarioResult:
 
 # ── 3. Multiple errors in different files ────────────────────────────
 
+_MULTI_TEST_FILE = textwrap.dedent("""\
+    from auth import login
+    from db import connect
+    from api import handler
+    def test_auth(): assert login("u") is True
+    def test_db(): assert connect("x") is None
+    def test_api(): assert handler({}) == {}
+""")
+
+_MULTI_FAIL_OUT = textwrap.dedent("""\
+    FAILED test_all.py::test_auth
+    File "auth.py", line 1
+        def login(user)
+                       ^
+    SyntaxError: expected ':'
+
+    FAILED test_all.py::test_db
+    File "db.py", line 1
+        def connect(url)
+                        ^
+    SyntaxError: expected ':'
+
+    FAILED test_all.py::test_api
+    File "api.py", line 1
+        def handler(req)
+                        ^
+    SyntaxError: expected ':'
+
+    3 failed in 0.05s
+""")
+
+
 async def scenario_multiple_errors(tmp: Path) -> ScenarioResult:
     """Three bugs in different files — agent must batch-fix and commits <= iterations."""
     sr = ScenarioResult(name="3) Multiple errors in different files")
 
-    repo = tmp / "multi_bug"
-    repo.mkdir()
-    (repo / "auth.py").write_text("def login(user)\n    return True\n")
-    (repo / "db.py").write_text("def connect(url)\n    return None\n")
-    (repo / "api.py").write_text("def handler(req)\n    return {}\n")
-    (repo / "test_all.py").write_text(textwrap.dedent("""\
-        from auth import login
-        from db import connect
-        from api import handler
-        def test_auth(): assert login("u") is True
-        def test_db(): assert connect("x") is None
-        def test_api(): assert handler({}) == {}
-    """))
-    _init_git(repo)
-
-    fail_out = textwrap.dedent("""\
-        FAILED test_all.py::test_auth
-        File "auth.py", line 1
-            def login(user)
-                           ^
-        SyntaxError: expected ':'
-
-        FAILED test_all.py::test_db
-        File "db.py", line 1
-            def connect(url)
-                            ^
-        SyntaxError: expected ':'
-
-        FAILED test_all.py::test_api
-        File "api.py", line 1
-            def handler(req)
-                            ^
-        SyntaxError: expected ':'
-
-        3 failed in 0.05s
-    """)
+    repo = _make_repo(tmp / "multi_bug", {
+        "auth.py": "def login(user)\n    return True\n",
+        "db.py": "def connect(url)\n    return None\n",
+        "api.py": "def handler(req)\n    return {}\n",
+        "test_all.py": _MULTI_TEST_FILE,
+    })
+
     pass_out = "3 passed in 0.02s\n"
 
     async def run_tests(repo_path, test_command, install_deps=True):
-        return _mock_exec(False, stdout=fail_out)
+        return _mock_exec(False, stdout=_MULTI_FAIL_OUT)
 
     mock_exec = MagicMock()
     mock_exec.run_tests = run_tests
@@ -314,11 +442,7 @@ async def scenario_multiple_errors(tmp: Path) -> ScenarioResult:
     ci_client = _mock_ci_client("success", pass_out)
 
     try:
-        with patch("agents.tools.test_runner_tool._get_executor", return_value=mock_exec), \
-             patch("agents.tools.commit_push_tool.subprocess.run", side_effect=_mock_git()), \
-             patch("agents.tools.wait_for_ci_tool.httpx.AsyncClient", return_value=ci_client), \
-             patch("agents.tools.fetch_ci_results_tool.httpx.AsyncClient", return_value=ci_client):
-
+        with _use_mocks(executor=mock_exec, git=_mock_git(), ci_client=ci_client):
             result = await run_reasoning_loop(
                 repo_path=str(repo),
                 max_iterations=5,
@@ -361,67 +485,53 @@ async def scenario_ci_only_failure(tmp: Path) -> ScenarioResult:
     """
     sr = ScenarioResult(name="4) CI-only failure simulation")
 
-    repo = tmp / "ci_only"
-    repo.mkdir()
-    (repo / "app.py").write_text("def greet(name)\n    return f'Hello, {name}!'\n")
-    (repo / "test_app.py").write_text(
-        "from app import greet\ndef test_greet():\n    assert greet('X') == 'Hello, X!'\n"
-    )
-    _init_git(repo)
-
-    fail_out = textwrap.dedent("""\
-        FAILED test_app.py::test_greet
-        File "app.py", line 1
-            def greet(name)
-                           ^
-        SyntaxError: expected ':'
-    """)
+    repo = _make_repo(tmp / "ci_only", {
+        "app.py": "def greet(name)\n    return f'Hello, {name}!'\n",
+        "test_app.py":
+            "from app import greet\ndef test_greet():\n    assert greet('X') == 'Hello, X!'\n",
+    })
 
     # Local tests always report the same syntax error (executor mock is
     # stateless), so the agent will keep classifying the same bug.
     async def run_tests(repo_path, test_command, install_deps=True):
-        return _mock_exec(False, stdout=fail_out)
+        return _mock_exec(False, stdout=_GREET_SYNTAX_FAIL_OUT)
 
     mock_exec = MagicMock()
     mock_exec.run_tests = run_tests
 
     # CI: first iteration returns "failure", second returns "success"
-    ci_iteration = {"n": 0}
     ci_fail_log = "FAILED test_app.py::test_greet\nAssertionError: env var missing\n1 failed\n"
     ci_pass_log = "1 passed in 0.01s\n"
 
+    # (status response, logs response) per CI check: one failing check,
+    # then passing for every later one.
+    fail_phase = (
+        _ci_response(runs=[{
+            "id": 1, "head_sha": "aaa1111",
+            "status": "completed", "conclusion": "failure",
+            "html_url": "http://ci/1",
+        }]),
+        _ci_response(content=_make_ci_log_zip(ci_fail_log)),
+    )
+    pass_phase = (
+        _ci_response(runs=[{
+            "id": 2, "head_sha": "aaa1111",
+            "status": "completed", "conclusion": "success",
+            "html_url": "http://ci/2",
+        }]),
+        _ci_response(content=_make_ci_log_zip(ci_pass_log)),
+    )
+
     def _make_ci_client_dynamic():
+        phases = itertools.chain([fail_phase], itertools.repeat(pass_phase))
+        current = [fail_phase]
+
         async def _get(url, **kw):
-            resp = MagicMock()
-            resp.status_code = 200
-            resp.raise_for_status = MagicMock()
-            is_logs = "logs" in url
-
-            if not is_logs:
-                # Status check — count iterations
-                ci_iteration["n"] += 1
-
-            if ci_iteration["n"] <= 1:
-                # First CI check: failure
-                if is_logs:
-                    resp.content = _make_ci_log_zip(ci_fail_log)
-                else:
-                    resp.json = MagicMock(return_value={"workflow_runs": [{
-                        "id": 1, "head_sha": "aaa1111",
-                        "status": "completed", "conclusion": "failure",
-                        "html_url": "http://ci/1",
-                    }]})
-            else:
-                # Subsequent CI checks: success
-                if is_logs:
-                    resp.content = _make_ci_log_zip(ci_pass_log)
-                else:
-                    resp.json = MagicMock(return_value={"workflow_runs": [{
-                        "id": 2, "head_sha": "aaa1111",
-                        "status": "completed", "conclusion": "success",
-                        "html_url": "http://ci/2",
-                    }]})
-            return resp
+            if "logs" in url:
+                return current[0][1]
+            # Status check — advance to the next CI check
+            current[0] = next(phases)
+            return current[0][0]
 
         client = AsyncMock()
         client.get = _get
@@ -432,11 +542,7 @@ async def scenario_ci_only_failure(tmp: Path) -> ScenarioResult:
     ci_client = _make_ci_client_dynamic()
 
     try:
-        with patch("agents.tools.test_runner_tool._get_executor", return_value=mock_exec), \
-             patch("agents.tools.commit_push_tool.subprocess.run", side_effect=_mock_git()), \
-             patch("agents.tools.wait_for_ci_tool.httpx.AsyncClient", return_value=ci_client), \
-             patch("agents.tools.fetch_ci_results_tool.httpx.AsyncClient", return_value=ci_client):
-
+        with _use_mocks(executor=mock_exec, git=_mock_git(), ci_client=ci_client):
             result = await run_reasoning_loop(
                 repo_path=str(repo),
                 max_iterations=5,
@@ -468,37 +574,35 @@ async def scenario_ci_only_failure(tmp: Path) -> ScenarioResult:
 
 # ── 5. Missing dependency (crash resilience) ────────────────────────
 
+_MISSING_DEP_ERROR_OUT = textwrap.dedent("""\
+    ERROR collecting test_app.py
+    ImportError while importing test module 'test_app.py'.
+    Hint: make sure your test modules/packages have valid Python names.
+    ModuleNotFoundError: No module named 'nonexistent_lib'
+
+    ======= short test summary info ========
+    ERROR test_app.py
+    !! Errors during collection !!
+""")
+
+
 async def scenario_missing_dependency(tmp: Path) -> ScenarioResult:
     """Import error on test run — agent should not crash, mark FAILED gracefully."""
     sr = ScenarioResult(name="5) Missing dependency")
 
-    repo = tmp / "missing_dep"
-    repo.mkdir()
-    (repo / "app.py").write_text("import nonexistent_lib\ndef run(): pass\n")
-    (repo / "test_app.py").write_text(
-        "from app import run\ndef test_run():\n    run()\n"
-    )
-    _init_git(repo)
-
-    error_out = textwrap.dedent("""\
-        ERROR collecting test_app.py
-        ImportError while importing test module 'test_app.py'.
-        Hint: make sure your test modules/packages have valid Python names.
-        ModuleNotFoundError: No module named 'nonexistent_lib'
-
-        ======= short test summary info ========
-        ERROR test_app.py
-        !! Errors during collection !!
-    """)
+    repo = _make_repo(tmp / "missing_dep", {
+        "app.py": "import nonexistent_lib\ndef run(): pass\n",
+        "test_app.py": "from app import run\ndef test_run():\n    run()\n",
+    })
 
     async def run_tests(repo_path, test_command, install_deps=True):
-        return _mock_exec(False, stdout="", stderr=error_out)
+        return _mock_exec(False, stdout="", stderr=_MISSING_DEP_ERROR_OUT)
 
     mock_exec = MagicMock()
     mock_exec.run_tests = run_tests
 
     try:
-        with patch("agents.tools.test_runner_tool._get_executor", return_value=mock_exec):
+        with _use_mocks(executor=mock_exec):
             result = await run_reasoning_loop(
                 repo_path=str(repo),
                 max_iterations=3,
@@ -540,6 +644,26 @@ ALL_SCENARIOS = [
 ]
 
 
+async def _run_guarded(fn, tmpdir: Path) -> ScenarioResult:
+    """Run one scenario; an exception escaping it becomes a crashed result."""
+    try:
+        return await fn(tmpdir)
+    except Exception as exc:
+        return ScenarioResult(name=fn.__name__, crashed=True, error_msg=str(exc))
+
+
+async def _run_all(scenarios, tmpdir: Path) -> list[ScenarioResult]:
+    """Run *scenarios* concurrently on one event loop, in input order.
+
+    Scenario failures are results, so only cancellation (e.g. Ctrl-C)
+    tears the task group down — and it cancels every sibling with it.
+    """
+    with _patched_tools():
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(_run_guarded(fn, tmpdir)) for fn in scenarios]
+    return [task.result() for task in tasks]
+
+
 def _print_result(sr: ScenarioResult) -> None:
     tag = "PASS" if sr.all_passed else "FAIL"
     crash_tag = " [CRASHED]" if sr.crashed else ""
@@ -566,9 +690,6 @@ def main() -> int:
         import logging
         logging.basicConfig(level=logging.DEBUG, format="%(name)s %(message)s")
 
-    import tempfile
-    tmpdir = Path(tempfile.mkdtemp(prefix="torture_"))
-
     scenarios = ALL_SCENARIOS
     if args.k:
         idx = args.k - 1
@@ -580,10 +701,15 @@ def main() -> int:
 
     print(f"=== Torture Test — {len(scenarios)} scenario(s) ===")
 
-    results: list[ScenarioResult] = []
-    for fn in scenarios:
-        sr = asyncio.run(fn(tmpdir))
-        results.append(sr)
+    # Scenario repos are small and short-lived: keep them in RAM (tmpfs)
+    # on Linux, otherwise use the default temp dir.
+    base = "/dev/shm" if sys.platform == "linux" and os.path.isdir("/dev/shm") else None
+    tmpdir = Path(tempfile.mkdtemp(prefix="torture_", dir=base))
+    try:
+        results = asyncio.run(_run_all(scenarios, tmpdir))
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    for sr in results:
         _print_result(sr)
 
     # ── Summary ──────────────────────────────────────────────────────
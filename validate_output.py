@@ -24,26 +24,107 @@ import re
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib parser
+    orjson = None
+
 # ── Known valid bug types (from agents.bug_classifier.error_classifier) ──
-VALID_BUG_TYPES: set[str] = {
+VALID_BUG_TYPES: frozenset[str] = frozenset({
     "LINTING",
     "SYNTAX",
     "LOGIC",
     "TYPE_ERROR",
     "IMPORT",
     "INDENTATION",
-}
+})
 
 # Branch must be UPPERCASE_AND_UNDERSCORES only, ending with _AI_Fix
 _BRANCH_RE = re.compile(r"^[A-Z][A-Z0-9]*(_[A-Z][A-Z0-9]*)*_AI_Fix$")
 
+# Canonical fix line: {BUG_TYPE} error in {file} line {line} → Fix: {message}
+_FMT_RE = re.compile(
+    r"^(?P<bt>[A-Z_]+) error in (?P<f>.+?) line (?P<ln>\d+) \u2192 Fix: (?P<msg>.+)$"
+)
+
+
+# A non-newline whitespace char right before a line boundary (the
+# separators str.splitlines() splits on).  ``\s`` is the same Unicode
+# set str.rstrip() strips.
+_LINE_BREAKS = r"\n\r\v\f\x1c-\x1e\x85\u2028\u2029"
+_TRAIL_RE = re.compile(rf"[^\S{_LINE_BREAKS}][{_LINE_BREAKS}]")
+
 
 def _trailing_space(value: str) -> bool:
-    """Return True if *value* has trailing whitespace on any line."""
-    for line in value.splitlines():
-        if line != line.rstrip():
-            return True
-    return value != value.rstrip()
+    """Return True if *value* has trailing whitespace on any line.
+
+    The last line is checked directly; earlier ones by one ``_TRAIL_RE``
+    search over the whole string, without splitting it into lines.
+    """
+    return value[-1:].isspace() or _TRAIL_RE.search(value) is not None
+
+
+def _load_json(raw: bytes) -> object:
+    """Parse *raw* (UTF-8 JSON), with orjson when it is installed.
+
+    orjson rejects a few inputs ``json`` accepts (NaN/Infinity, integers
+    beyond 64 bits), so those fall back to the stdlib parser.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def _round_trips(bug_type: object, file: object, line: object, commit_msg: object) -> bool:
+    """True if the canonical line for these fields must parse back intact.
+
+    ``_FMT_RE`` recovers every field from the line as long as the bug type
+    is a known ``[A-Z_]+`` value, the line number is a non-negative int,
+    and file/message are non-empty single-line strings with no earlier
+    `` line `` for the lazy file group to stop at.
+    """
+    return (
+        bug_type in VALID_BUG_TYPES
+        and type(line) is int and line >= 0
+        and isinstance(file, str) and file != ""
+        and "\n" not in file and " line " not in file
+        and isinstance(commit_msg, str) and commit_msg != ""
+        and "\n" not in commit_msg
+    )
+
+
+def _format_errors(
+    prefix: str, bug_type: str, file: str, line: int, commit_msg: str,
+) -> list[str]:
+    """Build the canonical line from the fix fields and compare the parse."""
+    errors: list[str] = []
+    expected = f"{bug_type} error in {file} line {line} \u2192 Fix: {commit_msg}"
+    m = _FMT_RE.match(expected)
+    if m is None:
+        errors.append(
+            f"{prefix}: message format mismatch \u2013 could not parse "
+            f"canonical line: {expected!r}"
+        )
+        return errors
+    if m.group("bt") != bug_type:
+        errors.append(
+            f"{prefix}: bug_type in message {m.group('bt')!r} "
+            f"!= fix.bug_type {bug_type!r}"
+        )
+    if m.group("f") != file:
+        errors.append(
+            f"{prefix}: file in message {m.group('f')!r} "
+            f"!= fix.file {file!r}"
+        )
+    if int(m.group("ln")) != line:
+        errors.append(
+            f"{prefix}: line in message {m.group('ln')} "
+            f"!= fix.line {line}"
+        )
+    return errors
 
 
 def validate(results: dict) -> list[str]:
@@ -74,25 +155,30 @@ def validate(results: dict) -> list[str]:
     for idx, fix in enumerate(fixes):
         prefix = f"fixes[{idx}]"
 
+        get = fix.get
+        bug_type = get("bug_type", "")
+        file = get("file", "")
+        line = get("line", 0)
+        commit_msg = get("commit_message", "")
+        status = get("status", "")
+
         # -- bug_type --------------------------------------------------
-        bug_type = fix.get("bug_type", "")
-        if bug_type != bug_type.upper():
-            errors.append(f"{prefix}.bug_type: not uppercase: {bug_type!r}")
+        # Known values are uppercase, so only unknown ones need .upper()
         if bug_type not in VALID_BUG_TYPES:
+            if bug_type != bug_type.upper():
+                errors.append(f"{prefix}.bug_type: not uppercase: {bug_type!r}")
             errors.append(
                 f"{prefix}.bug_type: unknown value {bug_type!r}; "
                 f"expected one of {sorted(VALID_BUG_TYPES)}"
             )
 
-        # -- required fields -------------------------------------------
-        file = fix.get("file", "")
-        line = fix.get("line", 0)
-        commit_msg = fix.get("commit_message", "")
-        status = fix.get("status", "")
-
         # -- trailing whitespace on every string field -----------------
-        for field_name in ("file", "bug_type", "commit_message", "status"):
-            val = fix.get(field_name, "")
+        for field_name, val in (
+            ("file", file),
+            ("bug_type", bug_type),
+            ("commit_message", commit_msg),
+            ("status", status),
+        ):
             if isinstance(val, str) and _trailing_space(val):
                 errors.append(
                     f"{prefix}.{field_name}: trailing whitespace in {val!r}"
@@ -106,42 +192,17 @@ def validate(results: dict) -> list[str]:
             )
 
         # -- message format --------------------------------------------
-        # Build the expected canonical line from the fix fields.
-        expected = f"{bug_type} error in {file} line {line} \u2192 Fix: {commit_msg}"
-
         # 1) The arrow character must be → (U+2192)
-        if "->" in commit_msg or "\u2192" not in expected:
+        if "->" in commit_msg:
             errors.append(
                 f"{prefix}: arrow must be unicode \u2192 (U+2192), not '->'"
             )
 
-        # 2) Verify the canonical format can be reconstructed
-        #    We parse the generated line back and compare pieces.
-        fmt_re = re.compile(
-            r"^(?P<bt>[A-Z_]+) error in (?P<f>.+?) line (?P<ln>\d+) \u2192 Fix: (?P<msg>.+)$"
-        )
-        m = fmt_re.match(expected)
-        if m is None:
-            errors.append(
-                f"{prefix}: message format mismatch \u2013 could not parse "
-                f"canonical line: {expected!r}"
-            )
-        else:
-            if m.group("bt") != bug_type:
-                errors.append(
-                    f"{prefix}: bug_type in message {m.group('bt')!r} "
-                    f"!= fix.bug_type {bug_type!r}"
-                )
-            if m.group("f") != file:
-                errors.append(
-                    f"{prefix}: file in message {m.group('f')!r} "
-                    f"!= fix.file {file!r}"
-                )
-            if int(m.group("ln")) != line:
-                errors.append(
-                    f"{prefix}: line in message {m.group('ln')} "
-                    f"!= fix.line {line}"
-                )
+        # 2) Verify the canonical format can be reconstructed.  For plain
+        #    fields the round trip is guaranteed, so the line is only built
+        #    and parsed back when a field could break it.
+        if not _round_trips(bug_type, file, line, commit_msg):
+            errors.extend(_format_errors(prefix, bug_type, file, line, commit_msg))
 
     # ── CI timeline ──────────────────────────────────────────────────
     for idx, ci in enumerate(results.get("ci_timeline", [])):
@@ -164,8 +225,8 @@ def main(path: str | None = None) -> int:
         print(f"ERROR: {target} not found")
         return 1
 
-    with target.open() as f:
-        data = json.load(f)
+    # results.json is UTF-8 regardless of the platform's locale encoding
+    data = _load_json(target.read_bytes())
 
     # Support both bare object and {"runs": [...]} wrapper
     if "runs" in data and isinstance(data["runs"], list):